@@ -7,18 +7,23 @@ Fetches contest information from LeetCode API and determines:
 - Contest slugs, start/end timestamps
 """
 
+import json
 import logging
+import os
+import pickle
+import random
+import tempfile
+import threading
 import time
-from typing import Dict, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
 
-try:
-    import cloudscraper
-    CLOUDSCRAPER_AVAILABLE = True
-except ImportError:
-    CLOUDSCRAPER_AVAILABLE = False
+from json_utils import load_json, parse_json
 
 
 logger = logging.getLogger(__name__)
@@ -27,12 +32,215 @@ LEETCODE_CONTEST_LIST_API = "https://leetcode.com/contest/api/list/"
 LEETCODE_CONTEST_INFO_API = "https://leetcode.com/contest/api/info"
 MAX_RETRIES = 3
 RETRY_DELAY = 2
+PROBE_WORKERS = 8  # Concurrent contest-number probes
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32  # Must stay >= PROBE_WORKERS so no probe opens a throwaway connection
 
 # Contest number estimation constants
 # Weekly Contest #1 started around Jan 2016
 # Biweekly Contest #1 started around May 2019
 WEEKLY_CONTEST_START_DATE = datetime(2016, 1, 1)
 BIWEEKLY_CONTEST_START_DATE = datetime(2019, 5, 1)
+CONTEST_DURATION = timedelta(minutes=90)
+
+# On-disk cache location (survives process restarts)
+CACHE_DIR = Path.home() / ".cache" / "leetcode_contest"
+
+# Contest list cache (stale-while-revalidate): (fetched_at, contests)
+CONTEST_LIST_FRESH_TTL = 300  # seconds, served as-is
+CONTEST_LIST_STALE_TTL = 3600  # seconds, served while refreshing in background
+CONTEST_LIST_CACHE_FILE = CACHE_DIR / "contest_list.json"
+_contest_list_cache: Optional[tuple] = None
+_contest_list_lock = threading.Lock()
+_contest_list_refreshing = False
+
+# Contest info cache: slug -> (expires_at, info)
+# Finished contests never change, so they are kept until evicted by size.
+# Only complete infos (with problems) are cached; anything else is refetched
+CONTEST_INFO_CACHE_SIZE = 256
+CONTEST_INFO_TTL = 3600  # seconds, for contests that ended recently
+CONTEST_INFO_LIVE_TTL = 60  # seconds, for contests not finished yet (problems may change)
+CONTEST_FINALIZED_AFTER = 24 * 3600  # seconds after end_time
+_contest_info_cache: Dict[str, tuple] = {}
+_contest_info_lock = threading.Lock()
+
+# Shared HTTP session (keep-alive) reused by every LeetCode API call.
+# Starts as a plain requests session; swapped for cloudscraper only when
+# Cloudflare actually serves a JS challenge.
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_USING_CLOUDSCRAPER = False
+SESSION_HEADERS = {
+    'User-Agent': "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    'Accept': 'application/json'
+}
+
+# Persisted session cookies (Cloudflare cf_clearance) for warm starts, stored
+# with the User-Agent they were issued to (cf_clearance is bound to it)
+COOKIE_CACHE_FILE = CACHE_DIR / "cookies.pkl"
+COOKIE_CACHE_MAX_AGE = 24 * 3600  # seconds
+_saved_cookie_state = None
+_cookie_lock = threading.Lock()  # Probe threads may save concurrently
+
+
+def _get_session() -> requests.Session:
+    """
+    Return the shared HTTP session, creating it on first use.
+    
+    Reusing one session keeps the TCP+TLS connection to leetcode.com alive
+    across calls instead of paying a fresh handshake for every request, and
+    keeps Cloudflare's cf_clearance cookie so retries and later calls skip
+    the JS challenge. Fetch it once per attempt, not once per process: it is
+    replaced by a cloudscraper session if Cloudflare starts challenging us.
+    """
+    global _SESSION
+    
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                session.headers.update(SESSION_HEADERS)
+                session.mount("https://", HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=0
+                ))
+                _load_cookies(session)
+                _SESSION = session
+    
+    return _SESSION
+
+
+def _is_cloudflare_challenge(response) -> bool:
+    """Check whether a response is a Cloudflare JS challenge page."""
+    if response.status_code not in (403, 503):
+        return False
+    if response.headers.get('cf-mitigated') == 'challenge':
+        return True
+    return 'cf-chl' in response.text or 'challenge-platform' in response.text
+
+
+def _upgrade_session(stale_session: requests.Session) -> requests.Session:
+    """
+    Swap the shared session for a cloudscraper one (imported only now).
+    
+    Args:
+        stale_session: Session that just received a challenge; ignored if
+            another thread already replaced it
+    
+    Returns:
+        The session to retry with
+    """
+    global _SESSION, _USING_CLOUDSCRAPER
+    
+    with _SESSION_LOCK:
+        if _USING_CLOUDSCRAPER or _SESSION is not stale_session:
+            return _SESSION
+        
+        try:
+            import cloudscraper
+        except ImportError:
+            logger.warning("Cloudflare challenge received but cloudscraper is not installed. "
+                           "Install it with: pip install cloudscraper")
+            return _SESSION
+        
+        logger.info("Cloudflare challenge received, switching to cloudscraper session")
+        
+        # cloudscraper mounts its own TLS adapter on https://, keep it
+        # but resize its pool so concurrent probes all stay keep-alive
+        session = cloudscraper.create_scraper()
+        session.get_adapter("https://").init_poolmanager(POOL_CONNECTIONS, POOL_MAXSIZE)
+        _load_cookies(session)
+        
+        _SESSION = session
+        _USING_CLOUDSCRAPER = True
+        return session
+
+
+def _cookie_state(session: requests.Session) -> tuple:
+    """Comparable snapshot of the session User-Agent and cookie jar."""
+    cookies = sorted((c.domain, c.path, c.name, c.value) for c in session.cookies)
+    return session.headers.get('User-Agent'), cookies
+
+
+def _load_cookies(session: requests.Session) -> None:
+    """Restore cookies (and their User-Agent) saved by a previous run, if recent enough."""
+    global _saved_cookie_state
+    
+    try:
+        if time.time() - COOKIE_CACHE_FILE.stat().st_mtime > COOKIE_CACHE_MAX_AGE:
+            return
+        with open(COOKIE_CACHE_FILE, 'rb') as f:
+            saved = pickle.load(f)
+        if not isinstance(saved, dict):
+            raise ValueError("old cookie cache format without User-Agent")
+        session.cookies.update(saved['cookies'])
+        if saved.get('user_agent'):
+            session.headers['User-Agent'] = saved['user_agent']
+        _saved_cookie_state = _cookie_state(session)
+        logger.debug(f"Restored {len(session.cookies)} cookies from {COOKIE_CACHE_FILE}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable cookie cache: {e}")
+
+
+def _save_cookies(session: requests.Session) -> None:
+    """Persist the session cookies and User-Agent if they changed since the last save."""
+    global _saved_cookie_state
+    
+    with _cookie_lock:
+        state = _cookie_state(session)
+        if state == _saved_cookie_state:
+            return
+        
+        tmp_path = None
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Write a private temp file and swap it in, so readers never see a partial pickle
+            with tempfile.NamedTemporaryFile('wb', dir=CACHE_DIR, suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                pickle.dump({
+                    'user_agent': session.headers.get('User-Agent'),
+                    'cookies': session.cookies.copy()
+                }, f)
+            os.replace(tmp_path, COOKIE_CACHE_FILE)
+            _saved_cookie_state = state
+        except Exception as e:
+            logger.debug(f"Failed to save cookie cache: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+
+def _clear_cookies(session: requests.Session) -> None:
+    """Drop (possibly stale) Cloudflare cookies so the challenge is re-solved."""
+    global _saved_cookie_state
+    
+    with _cookie_lock:
+        session.cookies.clear()
+        _saved_cookie_state = None
+        try:
+            COOKIE_CACHE_FILE.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Failed to remove cookie cache: {e}")
+
+
+def _latest_possible_contest_number(series_start: datetime, period_weeks: int, min_elapsed: timedelta) -> int:
+    """
+    Highest contest number whose date-implied start + min_elapsed is not in the future.
+    
+    Contest i of a series starts (roughly) at series_start + i * period_weeks,
+    so any larger number cannot have started (or finished) yet and probing it
+    is a guaranteed wasted request.
+    """
+    elapsed = datetime.now() - min_elapsed - series_start
+    return int(elapsed.total_seconds() // timedelta(weeks=period_weeks).total_seconds())
 
 
 def estimate_current_contest_numbers():
@@ -54,95 +262,273 @@ def estimate_current_contest_numbers():
     return weekly_estimate, biweekly_estimate
 
 
+def _retry_after_seconds(response) -> Optional[float]:
+    """Parse a numeric Retry-After header, if present."""
+    retry_after = response.headers.get('Retry-After')
+    try:
+        return max(0.0, float(retry_after)) if retry_after is not None else None
+    except ValueError:
+        return None
+
+
+def _request_with_retry(url: str, allow_missing: bool = False):
+    """
+    GET a URL with the shared session, retrying according to the failure mode.
+    
+    - Cloudflare JS challenge: switch to cloudscraper and retry immediately
+    - 429: wait for Retry-After (falls back to exponential backoff)
+    - 403/5xx: exponential backoff with jitter (Cloudflare / transient errors)
+    - other non-200: not retried, the resource is missing or the request is wrong
+    - network errors: first retry is immediate, later ones back off
+    
+    Args:
+        url: URL to fetch
+        allow_missing: Return None for a 404 instead of raising
+    
+    Returns:
+        Response with status 200 (or None for a 404 when allow_missing)
+    
+    Raises:
+        RuntimeError: If no 200 response is obtained
+    """
+    last_error = None
+    
+    for attempt in range(1, MAX_RETRIES + 1):
+        backoff = RETRY_DELAY * 2 ** (attempt - 1) + random.uniform(0, 1)
+        session = _get_session()
+        
+        try:
+            response = session.get(url, timeout=15)
+        except requests.exceptions.RequestException as e:
+            last_error = e
+            logger.warning(f"Attempt {attempt}/{MAX_RETRIES} failed for {url}: {e}")
+            if attempt < MAX_RETRIES:
+                time.sleep(0 if attempt == 1 else backoff)
+            continue
+        
+        status = response.status_code
+        if status == 200:
+            _save_cookies(session)
+            return response
+        
+        if status == 404 and allow_missing:
+            return None
+        
+        last_error = RuntimeError(f"API returned {status}")
+        if status != 429 and status != 403 and status < 500:
+            break
+        
+        if _is_cloudflare_challenge(response):
+            # Retry with cloudscraper first; it reloads the saved clearance
+            # and User-Agent, so the challenge is only solved if they are stale
+            if _upgrade_session(session) is not session:
+                continue
+            # Challenged even on the upgraded session: the clearance is stale
+            _clear_cookies(session)
+        
+        logger.warning(f"Attempt {attempt}/{MAX_RETRIES} failed for {url}: {last_error}")
+        if attempt < MAX_RETRIES:
+            delay = _retry_after_seconds(response) if status == 429 else None
+            time.sleep(backoff if delay is None else delay)
+    
+    raise RuntimeError(str(last_error))
+
+
+def _download_contest_list() -> list:
+    """Download the list of all contests from LeetCode API (with retries)."""
+    try:
+        response = _request_with_retry(LEETCODE_CONTEST_LIST_API)
+        data = parse_json(response)
+    except Exception as e:
+        raise RuntimeError(f"Failed to fetch contest list: {e}")
+    
+    contests = data.get('contests', [])
+    
+    logger.debug(f"Fetched {len(contests)} total contests")
+    return contests
+
+
+def _load_contest_list_cache() -> Optional[tuple]:
+    """Load the contest list cache from disk, if present."""
+    try:
+        cached = load_json(CONTEST_LIST_CACHE_FILE)
+        return cached['fetched_at'], cached['contests']
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable contest list cache: {e}")
+        return None
+
+
+def _refresh_contest_list() -> list:
+    """Download the contest list and store it in memory and on disk."""
+    global _contest_list_cache
+    
+    contests = _download_contest_list()
+    fetched_at = time.time()
+    
+    with _contest_list_lock:
+        _contest_list_cache = (fetched_at, contests)
+    
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(CONTEST_LIST_CACHE_FILE, 'w') as f:
+            json.dump({'fetched_at': fetched_at, 'contests': contests}, f)
+    except Exception as e:
+        logger.debug(f"Failed to save contest list cache: {e}")
+    
+    return contests
+
+
+def _refresh_contest_list_in_background() -> None:
+    """Background refresh worker; never raises."""
+    global _contest_list_refreshing
+    
+    try:
+        _refresh_contest_list()
+    except Exception as e:
+        logger.warning(f"Background contest list refresh failed: {e}")
+    finally:
+        with _contest_list_lock:
+            _contest_list_refreshing = False
+
+
 def fetch_contest_list() -> list:
     """
     Fetch list of all contests from LeetCode API.
     
+    Uses a stale-while-revalidate cache: a list younger than
+    CONTEST_LIST_FRESH_TTL is returned as-is, one younger than
+    CONTEST_LIST_STALE_TTL is returned immediately while a background
+    thread refreshes it, anything older is refreshed synchronously.
+    
     Returns:
         List of contest objects with basic info
     """
-    url = LEETCODE_CONTEST_LIST_API
+    global _contest_list_cache, _contest_list_refreshing
     
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            if CLOUDSCRAPER_AVAILABLE:
-                scraper = cloudscraper.create_scraper()
-                response = scraper.get(url, timeout=15)
-            else:
-                response = requests.get(url, timeout=15)
-            
-            if response.status_code != 200:
-                raise RuntimeError(f"API returned {response.status_code}")
-            
-            data = response.json()
-            contests = data.get('contests', [])
-            
-            logger.debug(f"Fetched {len(contests)} total contests")
+    with _contest_list_lock:
+        cached = _contest_list_cache
+    
+    if cached is None:
+        cached = _load_contest_list_cache()
+        if cached is not None:
+            with _contest_list_lock:
+                _contest_list_cache = cached
+    
+    if cached is not None:
+        fetched_at, contests = cached
+        age = time.time() - fetched_at
+        
+        if age < CONTEST_LIST_FRESH_TTL:
+            return contests
+        
+        if age < CONTEST_LIST_STALE_TTL:
+            with _contest_list_lock:
+                start_refresh = not _contest_list_refreshing
+                _contest_list_refreshing = True
+            if start_refresh:
+                threading.Thread(target=_refresh_contest_list_in_background, daemon=True).start()
             return contests
-            
-        except Exception as e:
-            logger.warning(f"Attempt {attempt}/{MAX_RETRIES} failed: {e}")
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY * attempt)
-            else:
-                raise RuntimeError(f"Failed to fetch contest list: {e}")
     
-    return []
+    return _refresh_contest_list()
 
 
-def fetch_detailed_contest_info(contest_slug: str) -> Dict:
+def _cache_contest_info(contest_slug: str, info: Dict) -> None:
+    """Store contest info with an expiry based on how settled the contest is."""
+    if not info.get('problems'):
+        # Problems not published yet (or a bad response): don't pin it
+        return
+    
+    now = time.time()
+    end_time = info.get('end_time')
+    
+    if end_time and end_time < now - CONTEST_FINALIZED_AFTER:
+        expires_at = float('inf')
+    elif end_time and end_time < now:
+        expires_at = now + CONTEST_INFO_TTL
+    else:
+        expires_at = now + CONTEST_INFO_LIVE_TTL
+    
+    with _contest_info_lock:
+        _contest_info_cache.pop(contest_slug, None)
+        _contest_info_cache[contest_slug] = (expires_at, info)
+        
+        # Evict oldest entries (dicts keep insertion order)
+        while len(_contest_info_cache) > CONTEST_INFO_CACHE_SIZE:
+            del _contest_info_cache[next(iter(_contest_info_cache))]
+
+
+def fetch_detailed_contest_info(contest_slug: str) -> Optional[Dict]:
     """
     Fetch detailed contest information including problems.
     
+    Results are cached per slug (see CONTEST_INFO_* constants), so repeated
+    lookups during detection and problem fetching do not hit the network.
+    
     Args:
         contest_slug: Contest identifier (e.g., "weekly-contest-478")
     
     Returns:
-        Dictionary with start_time, duration, problems, etc.
+        Dictionary with start_time, duration, problems, etc., or None if the
+        contest does not exist or could not be fetched
     """
+    try:
+        return _fetch_contest_info(contest_slug)
+    except Exception as e:
+        logger.error(f"Failed to fetch detailed info for {contest_slug}: {e}")
+        return None
+
+
+def _fetch_contest_info(contest_slug: str) -> Optional[Dict]:
+    """
+    Like fetch_detailed_contest_info, but tells "missing" from "unreachable".
+    
+    Returns:
+        Contest info, or None if LeetCode has no such contest (404 or a
+        payload without contest metadata)
+    
+    Raises:
+        Exception: If the request fails (network error, retries exhausted, bad JSON)
+    """
+    with _contest_info_lock:
+        cached = _contest_info_cache.get(contest_slug)
+    
+    if cached and cached[0] > time.time():
+        logger.debug(f"Contest info cache hit for {contest_slug}")
+        return cached[1]
+    
     url = f"{LEETCODE_CONTEST_INFO_API}/{contest_slug}/"
     
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            if CLOUDSCRAPER_AVAILABLE:
-                scraper = cloudscraper.create_scraper()
-                response = scraper.get(url, timeout=15)
-            else:
-                response = requests.get(url, timeout=15)
-            
-            if response.status_code != 200:
-                raise RuntimeError(f"API returned {response.status_code}")
-            
-            data = response.json()
-            
-            # Extract contest metadata
-            contest_info = data.get('contest', {})
-            start_time = contest_info.get('start_time')
-            duration = contest_info.get('duration')
-            title = contest_info.get('title', '')
-            
-            # Extract problems
-            questions = data.get('questions', [])
-            problems = [q.get('title_slug') for q in questions if 'title_slug' in q]
-            
-            return {
-                'title': title,
-                'slug': contest_slug,
-                'start_time': int(start_time) if start_time else None,
-                'duration': int(duration) if duration else None,
-                'end_time': int(start_time) + int(duration) if (start_time and duration) else None,
-                'problems': problems
-            }
-            
-        except Exception as e:
-            logger.warning(f"Attempt {attempt}/{MAX_RETRIES} failed for {contest_slug}: {e}")
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY * attempt)
-            else:
-                logger.error(f"Failed to fetch detailed info for {contest_slug}")
-                return None
+    response = _request_with_retry(url, allow_missing=True)
+    if response is None:
+        return None
+    data = parse_json(response)
     
-    return None
+    # Extract contest metadata (an empty payload means no such contest)
+    contest_info = data.get('contest') or {}
+    if not contest_info:
+        return None
+    
+    start_time = contest_info.get('start_time')
+    duration = contest_info.get('duration')
+    title = contest_info.get('title', '')
+    
+    # Extract problems
+    questions = data.get('questions', [])
+    problems = [q.get('title_slug') for q in questions if 'title_slug' in q]
+    
+    info = {
+        'title': title,
+        'slug': contest_slug,
+        'start_time': int(start_time) if start_time else None,
+        'duration': int(duration) if duration else None,
+        'end_time': int(start_time) + int(duration) if (start_time and duration) else None,
+        'problems': problems
+    }
+    
+    _cache_contest_info(contest_slug, info)
+    return info
 
 
 def parse_contest_id(title_slug: str) -> Optional[int]:
@@ -159,86 +545,277 @@ def parse_contest_id(title_slug: str) -> Optional[int]:
     Returns:
         Contest number or None
     """
+    # rfind + slice avoids building the intermediate list that split() would
+    idx = title_slug.rfind('-')
     try:
-        parts = title_slug.split('-')
-        return int(parts[-1])
-    except (ValueError, IndexError):
+        return int(title_slug[idx + 1:])
+    except ValueError:
         return None
 
 
-def get_recent_contests(include_upcoming: bool = False) -> Dict:
+def _listed_contests(kind: str) -> List[Dict]:
     """
-    Get the most recent Weekly and Biweekly contests using range-based search.
-    LeetCode's contest list API is unreliable, so we check contest numbers directly.
-    Uses dynamic range calculation to avoid hard-coded limits.
+    Get contests of one kind from the contest list API, oldest first.
+    
+    Args:
+        kind: "weekly" or "biweekly"
+    
+    Returns:
+        List entries (title, title_slug, start_time, duration, ...) sorted by
+        start_time; empty if the list API is unavailable
     """
-    logger.info("Detecting recent contests...")
+    prefix = f"{kind}-contest-"
     
-    current_time = int(time.time())
+    try:
+        contests = fetch_contest_list()
+    except Exception as e:
+        logger.warning(f"Contest list API unavailable, falling back to probing: {e}")
+        return []
+    
+    listed = [
+        c for c in contests
+        if (c.get('title_slug') or '').startswith(prefix) and c.get('start_time') and c.get('duration')
+    ]
+    listed.sort(key=lambda c: int(c['start_time']))
+    return listed
+
+
+def _resolve_listed_contests(entries: Dict[str, Optional[Dict]]) -> Dict[str, Dict]:
+    """
+    Turn contest list entries into full contest info (with problems).
     
-    latest_weekly = None
-    latest_biweekly = None
+    Problems for all entries are fetched with one batched GraphQL request;
+    any entry it cannot resolve falls back to fetch_detailed_contest_info.
     
-    # Get estimated current contest numbers
-    weekly_estimate, biweekly_estimate = estimate_current_contest_numbers()
+    Args:
+        entries: Mapping of kind ("weekly"/"biweekly") to list entry or None
     
-    # Search for latest weekly contest (check backwards from estimate)
-    # Search range: estimate to (estimate - 20) to handle gaps/skipped contests
-    weekly_start = max(weekly_estimate, 470)  # Minimum 470 as safety floor
-    weekly_end = weekly_start - 25
+    Returns:
+        Mapping of kind to contest info, for the entries that resolved
+    """
+    # Imported here: contest_fetcher depends on this module
+    from contest_fetcher import fetch_contest_problems_batch
     
-    logger.info(f"Searching for latest weekly contest in range {weekly_start} to {weekly_end}...")
-    for i in range(weekly_start, weekly_end, -1):
-        slug = f"weekly-contest-{i}"
-        contest_info = fetch_detailed_contest_info(slug)
+    entries = {kind: entry for kind, entry in entries.items() if entry}
+    if not entries:
+        return {}
+    
+    try:
+        problems_by_slug = fetch_contest_problems_batch([entry['title_slug'] for entry in entries.values()])
+    except Exception as e:
+        logger.warning(f"Batched problem fetch failed, fetching contests one by one: {e}")
+        problems_by_slug = {}
+    
+    resolved = {}
+    for kind, entry in entries.items():
+        slug = entry['title_slug']
+        problems = problems_by_slug.get(slug)
         
-        if contest_info and contest_info['start_time']:
-            start_time = contest_info['start_time']
-            end_time = contest_info['end_time']
-            
-            # If we want recent completed contests
-            if not include_upcoming and end_time < current_time:
-                latest_weekly = contest_info
-                logger.info(f"Found latest weekly: {slug}")
-                break
-            # If we want upcoming contests too
-            elif include_upcoming:
-                latest_weekly = contest_info
-                logger.info(f"Found weekly: {slug}")
-                break
-    
-    # Search for latest biweekly contest (check backwards from estimate)
-    biweekly_start = max(biweekly_estimate, 140)  # Minimum 140 as safety floor
-    biweekly_end = biweekly_start - 15
-    
-    logger.info(f"Searching for latest biweekly contest in range {biweekly_start} to {biweekly_end}...")
-    for i in range(biweekly_start, biweekly_end, -1):
-        slug = f"biweekly-contest-{i}"
-        contest_info = fetch_detailed_contest_info(slug)
+        if problems:
+            start_time = int(entry['start_time'])
+            duration = int(entry['duration'])
+            contest_info = {
+                'title': entry.get('title', ''),
+                'slug': slug,
+                'start_time': start_time,
+                'duration': duration,
+                'end_time': start_time + duration,
+                'problems': problems
+            }
+            _cache_contest_info(slug, contest_info)
+        else:
+            contest_info = fetch_detailed_contest_info(slug)
         
+        if contest_info:
+            resolved[kind] = contest_info
+    
+    return resolved
+
+
+def _recent_list_entry(kind: str, current_time: int, include_upcoming: bool) -> Optional[Dict]:
+    """Pick the latest (finished, unless include_upcoming) contest from the list API."""
+    listed = _listed_contests(kind)
+    
+    if not include_upcoming:
+        listed = [c for c in listed if int(c['start_time']) + int(c['duration']) < current_time]
+    
+    return listed[-1] if listed else None
+
+
+def _next_list_entry(kind: str, current_time: int) -> Optional[Dict]:
+    """Pick the next not-yet-started contest from the list API."""
+    upcoming = [c for c in _listed_contests(kind) if int(c['start_time']) > current_time]
+    return upcoming[0] if upcoming else None
+
+
+def _probe_contests(slugs: List[str]) -> List[Optional[Dict]]:
+    """
+    Fetch detailed info for several contest slugs concurrently.
+    
+    The probes are independent requests to the same host, so they are fanned
+    out over a small thread pool sharing the keep-alive session.
+    
+    Args:
+        slugs: Contest slugs to probe
+    
+    Returns:
+        Contest info (or None) for each slug, in the same order as slugs
+    """
+    if not slugs:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(slugs))) as executor:
+        return list(executor.map(fetch_detailed_contest_info, slugs))
+
+
+def _find_latest(kind: str, lo: int, hi: int, current_time: int, include_upcoming: bool) -> Optional[Dict]:
+    """
+    Find the highest contest number in [lo, hi] that matches, in O(log N) probes.
+    
+    Contest numbers form a monotone region: every number up to the latest
+    match succeeds and every number above it fails (missing or unfinished).
+    So we double the step upward from lo until a probe fails, then binary
+    search inside the bracketed range.
+    
+    Only a missing or unfinished contest counts as a failed probe. A request
+    that fails outright (after retries) aborts the search, since treating it
+    as a boundary would silently return an older contest.
+    
+    Args:
+        kind: "weekly" or "biweekly"
+        lo: Contest number known to exist (safety floor)
+        hi: Highest contest number worth probing
+        current_time: Reference UNIX timestamp
+        include_upcoming: Accept contests that have not finished yet
+    
+    Returns:
+        Contest info for the latest matching contest, or None
+    """
+    try:
+        return _search_latest(kind, lo, hi, current_time, include_upcoming)
+    except Exception as e:
+        logger.error(f"Aborting {kind} contest search, a probe could not be fetched: {e}")
+        return None
+
+
+def _search_latest(kind: str, lo: int, hi: int, current_time: int, include_upcoming: bool) -> Optional[Dict]:
+    """Search loop for _find_latest; raises if any probe request fails."""
+    probed = {}
+    
+    def matches(number: int) -> bool:
+        if number not in probed:
+            probed[number] = _fetch_contest_info(f"{kind}-contest-{number}")
+        contest_info = probed[number]
+        if not contest_info or not contest_info['start_time']:
+            return False
+        return include_upcoming or contest_info['end_time'] < current_time
+    
+    if not matches(lo):
+        logger.warning(f"No {kind} contest found at search floor {lo}")
+        return None
+    
+    # Exponential phase: grow the step until a probe fails or we reach hi
+    good, bad, step = lo, None, 1
+    while good < hi:
+        candidate = min(good + step, hi)
+        if matches(candidate):
+            good = candidate
+            step *= 2
+        else:
+            bad = candidate
+            break
+    
+    # Binary phase: latest match lies in [good, bad)
+    if bad is not None:
+        while bad - good > 1:
+            mid = (good + bad) // 2
+            if matches(mid):
+                good = mid
+            else:
+                bad = mid
+    
+    logger.info(f"Found latest {kind}: {kind}-contest-{good} ({len(probed)} probes)")
+    return probed[good]
+
+
+def _probe_next(kind: str, numbers: range, current_time: int) -> Optional[Dict]:
+    """Probe contest numbers (oldest first) for the next contest not yet started."""
+    slugs = [f"{kind}-contest-{i}" for i in numbers]
+    
+    for slug, contest_info in zip(slugs, _probe_contests(slugs)):
         if contest_info and contest_info['start_time']:
             start_time = contest_info['start_time']
-            end_time = contest_info['end_time']
             
-            # If we want recent completed contests
-            if not include_upcoming and end_time < current_time:
-                latest_biweekly = contest_info
-                logger.info(f"Found latest biweekly: {slug}")
-                break
-            # If we want upcoming contests too
-            elif include_upcoming:
-                latest_biweekly = contest_info
-                logger.info(f"Found biweekly: {slug}")
-                break
-    
-    return {
-        "weekly": latest_weekly,
-        "biweekly": latest_biweekly
-    }
+            if start_time > current_time:
+                logger.info(f"Found next {kind}: {slug} at {datetime.fromtimestamp(start_time)}")
+                return contest_info
+    
+    return None
+
+
+def get_recent_contests(include_upcoming: bool = False) -> Dict:
+    """
+    Get the most recent Weekly and Biweekly contests.
+    
+    Uses the contest list API first (one request for every contest). That API
+    is unreliable, so if it fails or lacks a contest kind we fall back to
+    checking contest numbers directly, using a dynamic range calculation to
+    avoid hard-coded limits. Weekly and biweekly searches run concurrently.
+    """
+    logger.info("Detecting recent contests...")
+    
+    current_time = int(time.time())
+    
+    # Skip contest numbers whose implied date is still in the future
+    # (or, for finished contests only, still within the contest duration)
+    min_elapsed = timedelta(0) if include_upcoming else CONTEST_DURATION
+    weekly_ceiling = _latest_possible_contest_number(WEEKLY_CONTEST_START_DATE, 1, min_elapsed)
+    biweekly_ceiling = _latest_possible_contest_number(BIWEEKLY_CONTEST_START_DATE, 2, min_elapsed)
+    
+    # One list request plus one batched problems request covers both kinds
+    listed = _resolve_listed_contests({
+        'weekly': _recent_list_entry('weekly', current_time, include_upcoming),
+        'biweekly': _recent_list_entry('biweekly', current_time, include_upcoming)
+    })
+    
+    def _find_weekly() -> Optional[Dict]:
+        latest_weekly = listed.get('weekly')
+        if latest_weekly:
+            logger.info(f"Found latest weekly from contest list: {latest_weekly['slug']}")
+            return latest_weekly
+        
+        # Search for latest weekly contest between the safety floor and the date ceiling
+        weekly_floor = 470  # Minimum 470 as safety floor
+        
+        logger.info(f"Searching for latest weekly contest in range {weekly_floor} to {weekly_ceiling}...")
+        return _find_latest('weekly', weekly_floor, max(weekly_ceiling, weekly_floor), current_time, include_upcoming)
+    
+    def _find_biweekly() -> Optional[Dict]:
+        latest_biweekly = listed.get('biweekly')
+        if latest_biweekly:
+            logger.info(f"Found latest biweekly from contest list: {latest_biweekly['slug']}")
+            return latest_biweekly
+        
+        # Search for latest biweekly contest between the safety floor and the date ceiling
+        biweekly_floor = 140  # Minimum 140 as safety floor
+        
+        logger.info(f"Searching for latest biweekly contest in range {biweekly_floor} to {biweekly_ceiling}...")
+        return _find_latest('biweekly', biweekly_floor, max(biweekly_ceiling, biweekly_floor), current_time, include_upcoming)
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        weekly_future = executor.submit(_find_weekly)
+        biweekly_future = executor.submit(_find_biweekly)
+        
+        return {
+            "weekly": weekly_future.result(),
+            "biweekly": biweekly_future.result()
+        }
 def get_upcoming_contests() -> Dict:
     """
     Get upcoming contests that haven't started yet.
-    Uses dynamic range calculation based on current date.
+    Uses the contest list API first, then falls back to a dynamic range
+    calculation based on current date. Weekly and biweekly searches run
+    concurrently.
     
     Returns:
         Dictionary with next weekly and biweekly contests
@@ -247,50 +824,47 @@ def get_upcoming_contests() -> Dict:
     
     current_time = int(time.time())
     
-    next_weekly = None
-    next_biweekly = None
-    
     # Get estimated current contest numbers
     weekly_estimate, biweekly_estimate = estimate_current_contest_numbers()
     
-    # Try to find next weekly contest (check forward from estimate)
-    weekly_start = max(weekly_estimate - 2, 470)  # Start slightly before estimate
-    weekly_end = weekly_start + 10
+    # One list request plus one batched problems request covers both kinds
+    listed = _resolve_listed_contests({
+        'weekly': _next_list_entry('weekly', current_time),
+        'biweekly': _next_list_entry('biweekly', current_time)
+    })
     
-    logger.info(f"Searching for next weekly contest in range {weekly_start} to {weekly_end}...")
-    for i in range(weekly_start, weekly_end):
-        slug = f"weekly-contest-{i}"
-        contest_info = fetch_detailed_contest_info(slug)
+    def _find_weekly() -> Optional[Dict]:
+        next_weekly = listed.get('weekly')
+        if next_weekly:
+            return next_weekly
         
-        if contest_info and contest_info['start_time']:
-            start_time = contest_info['start_time']
-            
-            if start_time > current_time:
-                next_weekly = contest_info
-                logger.info(f"Found next weekly: {slug} at {datetime.fromtimestamp(start_time)}")
-                break
-    
-    # Try to find next biweekly contest (check forward from estimate)
-    biweekly_start = max(biweekly_estimate - 1, 140)  # Start slightly before estimate
-    biweekly_end = biweekly_start + 8
-    
-    logger.info(f"Searching for next biweekly contest in range {biweekly_start} to {biweekly_end}...")
-    for i in range(biweekly_start, biweekly_end):
-        slug = f"biweekly-contest-{i}"
-        contest_info = fetch_detailed_contest_info(slug)
+        # Try to find next weekly contest (check forward from estimate)
+        weekly_start = max(weekly_estimate - 2, 470)  # Start slightly before estimate
+        weekly_end = weekly_start + 10
         
-        if contest_info and contest_info['start_time']:
-            start_time = contest_info['start_time']
-            
-            if start_time > current_time:
-                next_biweekly = contest_info
-                logger.info(f"Found next biweekly: {slug} at {datetime.fromtimestamp(start_time)}")
-                break
+        logger.info(f"Searching for next weekly contest in range {weekly_start} to {weekly_end}...")
+        return _probe_next('weekly', range(weekly_start, weekly_end), current_time)
     
-    return {
-        "weekly": next_weekly,
-        "biweekly": next_biweekly
-    }
+    def _find_biweekly() -> Optional[Dict]:
+        next_biweekly = listed.get('biweekly')
+        if next_biweekly:
+            return next_biweekly
+        
+        # Try to find next biweekly contest (check forward from estimate)
+        biweekly_start = max(biweekly_estimate - 1, 140)  # Start slightly before estimate
+        biweekly_end = biweekly_start + 8
+        
+        logger.info(f"Searching for next biweekly contest in range {biweekly_start} to {biweekly_end}...")
+        return _probe_next('biweekly', range(biweekly_start, biweekly_end), current_time)
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        weekly_future = executor.submit(_find_weekly)
+        biweekly_future = executor.submit(_find_biweekly)
+        
+        return {
+            "weekly": weekly_future.result(),
+            "biweekly": biweekly_future.result()
+        }
 
 
 if __name__ == '__main__':
@@ -2,31 +2,28 @@
 Contest Fetcher - Retrieve contest problems from LeetCode API
 
 Fetches the list of problems (titleSlugs) for a given contest using
-LeetCode's REST API endpoint with cloudscraper to bypass Cloudflare protection.
+LeetCode's REST API endpoint. Requests go through the shared contest_detector
+session, which switches to cloudscraper only if Cloudflare challenges it.
 """
 
 import logging
-import time
-from typing import List
+from typing import Dict, List
 
-try:
-    import cloudscraper
-    CLOUDSCRAPER_AVAILABLE = True
-except ImportError:
-    CLOUDSCRAPER_AVAILABLE = False
-    import requests
+from contest_detector import _get_session, fetch_detailed_contest_info
+from json_utils import parse_json
 
 
 logger = logging.getLogger(__name__)
 
-LEETCODE_CONTEST_API = "https://leetcode.com/contest/api/info"
-MAX_RETRIES = 3
-RETRY_DELAY = 2  # seconds
+LEETCODE_GRAPHQL_API = "https://leetcode.com/graphql/"
 
 
 def fetch_contest_problems(contest_slug: str, manual_problems: List[str] = None) -> List[str]:
     """
-    Fetch contest problems using LeetCode REST API with cloudscraper or use manual list.
+    Fetch contest problems using LeetCode REST API or use manual list.
+    
+    Reuses the (cached) contest info from contest_detector, which hits the same
+    /contest/api/info/<slug>/ endpoint, instead of issuing a second request.
     
     Args:
         contest_slug: Contest identifier (e.g., "weekly-contest-478")
@@ -43,88 +40,80 @@ def fetch_contest_problems(contest_slug: str, manual_problems: List[str] = None)
         logger.info(f"Using manually configured problems ({len(manual_problems)} problems)")
         return manual_problems
     
-    # Check if cloudscraper is available
-    if not CLOUDSCRAPER_AVAILABLE:
-        logger.warning("cloudscraper not installed. Install it with: pip install cloudscraper")
-        logger.info("Falling back to manual problems if provided")
-        if manual_problems:
-            return manual_problems
+    logger.info(f"Fetching contest problems for {contest_slug}...")
+    
+    # Retries and caching are handled by fetch_detailed_contest_info
+    contest_info = fetch_detailed_contest_info(contest_slug)
+    
+    if contest_info is None:
         raise RuntimeError(
-            "cloudscraper is required to bypass Cloudflare protection. "
-            "Install it with: pip install cloudscraper"
+            f"Failed to fetch contest problems for {contest_slug}. "
+            "Contest may not be unlocked yet or invalid contest name."
         )
     
-    # Use REST API endpoint
-    url = f"{LEETCODE_CONTEST_API}/{contest_slug}/"
-    
-    logger.info(f"Fetching contest info: {url}")
-    
-    # Retry loop with exponential backoff
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            logger.info(f"Fetching contest problems (attempt {attempt}/{MAX_RETRIES})...")
-            
-            # Create cloudscraper session to bypass Cloudflare
-            scraper = cloudscraper.create_scraper()
-            
-            response = scraper.get(url, timeout=10)
-            
-            logger.info(f"Status code: {response.status_code}")
-            
-            if response.status_code != 200:
-                logger.error(f"Non-200 status code: {response.status_code}")
-                logger.debug(f"Response: {response.text[:500]}")
-                
-                if attempt < MAX_RETRIES:
-                    delay = RETRY_DELAY * (2 ** (attempt - 1))
-                    logger.info(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
-                    continue
-                else:
-                    raise RuntimeError(
-                        f"Contest API returned {response.status_code}. "
-                        "Contest may not be unlocked yet or invalid contest name."
-                    )
-            
-            data = response.json()
-            
-            # Check for contest data
-            if 'questions' not in data:
-                logger.error("No questions found in response")
-                
-                if attempt < MAX_RETRIES:
-                    delay = RETRY_DELAY * (2 ** (attempt - 1))
-                    logger.info(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
-                    continue
-                else:
-                    raise RuntimeError(f"Contest not found or no questions: {contest_slug}")
-            
-            questions = data.get('questions', [])
-            
-            if not questions:
-                logger.warning("Contest found but contains no questions")
-                return []
-            
-            # Extract titleSlugs - LeetCode API returns "title_slug" field
-            title_slugs = []
-            for q in questions:
-                slug = q.get('title_slug')
-                if slug:
-                    title_slugs.append(slug)
-                    logger.debug(f"Found problem: {slug}")
-            
-            logger.info(f"Successfully fetched {len(title_slugs)} problems")
-            return title_slugs
-            
-        except Exception as e:
-            logger.error(f"Request error: {e}")
-            
-            if attempt < MAX_RETRIES:
-                delay = RETRY_DELAY * (2 ** (attempt - 1))
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
-                raise RuntimeError(f"Failed to fetch contest problems: {e}")
-    
-    raise RuntimeError("Failed to fetch contest problems after all retries")
\ No newline at end of file
+    title_slugs = contest_info['problems']
+    
+    if not title_slugs:
+        logger.warning("Contest found but contains no questions")
+        return []
+    
+    for slug in title_slugs:
+        logger.debug(f"Found problem: {slug}")
+    
+    logger.info(f"Successfully fetched {len(title_slugs)} problems")
+    return title_slugs
+
+
+def fetch_contest_problems_batch(contest_slugs: List[str]) -> Dict[str, List[str]]:
+    """
+    Fetch problems for several contests with a single GraphQL request.
+    
+    Builds one query with an aliased contestQuestionList field per contest
+    (c0, c1, ...) so all contests are resolved in one round trip.
+    
+    Args:
+        contest_slugs: Contest identifiers (e.g., ["weekly-contest-478", "biweekly-contest-145"])
+    
+    Returns:
+        Dictionary mapping each resolved contest slug to its problem titleSlugs.
+        Contests the API could not resolve are left out.
+    
+    Raises:
+        RuntimeError: If the GraphQL request fails
+    """
+    if not contest_slugs:
+        return {}
+    
+    variables = {f"s{i}": slug for i, slug in enumerate(contest_slugs)}
+    params = ", ".join(f"${name}: String!" for name in variables)
+    fields = "\n".join(
+        f"  c{i}: contestQuestionList(contestSlug: $s{i}) {{ titleSlug }}"
+        for i in range(len(contest_slugs))
+    )
+    query = f"query contestProblemsBatch({params}) {{\n{fields}\n}}"
+    
+    logger.info(f"Fetching problems for {len(contest_slugs)} contests in one GraphQL request...")
+    
+    try:
+        response = _get_session().post(
+            LEETCODE_GRAPHQL_API,
+            json={'query': query, 'variables': variables},
+            headers={'Referer': 'https://leetcode.com/contest/'},
+            timeout=15
+        )
+    except Exception as e:
+        raise RuntimeError(f"GraphQL request failed: {e}")
+    
+    if response.status_code != 200:
+        raise RuntimeError(f"GraphQL API returned {response.status_code}")
+    
+    data = (parse_json(response) or {}).get('data') or {}
+    
+    problems_by_slug = {}
+    for i, slug in enumerate(contest_slugs):
+        questions = data.get(f"c{i}")
+        if questions:
+            problems_by_slug[slug] = [q['titleSlug'] for q in questions if q.get('titleSlug')]
+    
+    logger.info(f"Resolved problems for {len(problems_by_slug)}/{len(contest_slugs)} contests")
+    return problems_by_slug
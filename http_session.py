@@ -0,0 +1,94 @@
+"""
+HTTP Session - Keep-alive sessions with adapter-level retries
+
+Builds the shared requests.Session used for the third-party mirror APIs
+(submissions and daily stats). Transient failures (connection errors, 429
+honoring Retry-After, 5xx) are retried with exponential backoff inside the
+HTTPAdapter, and every retry takes a token from the caller's RateLimiter so
+retries count against the same request budget as first attempts.
+"""
+
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import RateLimiter
+
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class RateLimitedRetry(Retry):
+    """urllib3 Retry that acquires a rate-limiter token before each retry."""
+
+    def __init__(self, *args, rate_limiter: Optional[RateLimiter] = None, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs) -> "RateLimitedRetry":
+        # Retry.new() rebuilds the object from its standard parameters only
+        retry = super().new(**kwargs)
+        retry.rate_limiter = self.rate_limiter
+        return retry
+
+    def sleep(self, response=None) -> None:
+        super().sleep(response)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+
+def mount_retrying_adapter(
+    session: requests.Session,
+    pool_connections: int,
+    pool_maxsize: int,
+    rate_limiter: Optional[RateLimiter] = None,
+    total_retries: int = 3,
+    backoff_factor: float = 1
+) -> None:
+    """
+    Mount a pooled, retrying HTTPS adapter on session (replacing any existing one).
+
+    Args:
+        session: Session to configure
+        pool_connections: Number of hosts to keep connection pools for
+        pool_maxsize: Connections kept per host (should cover the worker count)
+        rate_limiter: Limiter charged once per retry, if given
+        total_retries: Retries per request before the error is raised
+        backoff_factor: Exponential backoff base in seconds
+    """
+    retry = RateLimitedRetry(
+        total=total_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        respect_retry_after_header=True,
+        allowed_methods=["GET"],
+        rate_limiter=rate_limiter
+    )
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry
+    ))
+
+
+def create_retrying_session(
+    pool_connections: int,
+    pool_maxsize: int,
+    rate_limiter: Optional[RateLimiter] = None,
+    total_retries: int = 3,
+    backoff_factor: float = 1
+) -> requests.Session:
+    """
+    Create a keep-alive session with a pooled, retrying HTTPS adapter.
+
+    Args are as for mount_retrying_adapter.
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    mount_retrying_adapter(session, pool_connections, pool_maxsize, rate_limiter, total_retries, backoff_factor)
+    return session
@@ -0,0 +1,32 @@
+"""
+JSON Utilities - Fast JSON parsing shared by all modules
+
+Uses orjson (parses straight from bytes) when it is installed and falls back
+to the standard library otherwise. orjson.JSONDecodeError subclasses
+json.JSONDecodeError, so callers can keep catching the stdlib exception.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def parse_json(response) -> Any:
+    """Parse a JSON HTTP response body (requests or cloudscraper response)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def load_json(path) -> Any:
+    """Read and parse a JSON file."""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
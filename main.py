@@ -14,11 +14,11 @@ import argparse
 import json
 import logging
 import sys
-import time
 from typing import Dict, List
 
 from contest_fetcher import fetch_contest_problems
-from submissions_parser import evaluate_student_submissions
+from json_utils import load_json
+from submissions_parser import DEFAULT_EVAL_WORKERS, evaluate_students, summarize_results
 from sheets_handler import SheetsHandler
 
 
@@ -30,34 +30,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Fields every config.json must define
+_REQUIRED_FIELDS = frozenset({
+    'sheet_id', 'sheet_name', 'service_account_file',
+    'contest_slug', 'contest_display_name',
+    'contest_start_ts', 'contest_end_ts'
+})
+
 
 def load_config(config_path: str = 'config.json') -> Dict:
     """Load configuration from JSON file."""
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        config = load_json(config_path)
         logger.info(f"Configuration loaded from {config_path}")
         return config
     except FileNotFoundError:
         logger.error(f"Configuration file not found: {config_path}")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses this
         logger.error(f"Invalid JSON in configuration file: {e}")
         sys.exit(1)
 
 
 def validate_config(config: Dict) -> None:
     """Validate required configuration fields."""
-    required_fields = [
-        'sheet_id', 'sheet_name', 'service_account_file',
-        'contest_slug', 'contest_display_name',
-        'contest_start_ts', 'contest_end_ts'
-    ]
-    
-    missing_fields = [field for field in required_fields if field not in config]
+    missing_fields = _REQUIRED_FIELDS - config.keys()
     
     if missing_fields:
-        logger.error(f"Missing required configuration fields: {', '.join(missing_fields)}")
+        logger.error(f"Missing required configuration fields: {', '.join(sorted(missing_fields))}")
         sys.exit(1)
     
     logger.info("Configuration validation passed")
@@ -119,56 +119,30 @@ def run_pipeline(config: Dict, dry_run: bool = False) -> None:
     
     # Step 3: Process each student
     logger.info("Step 3: Evaluating student submissions...")
-    results = []
-    stats = {'N/A': 0, '0': 0, 'INVALID ID': 0, 'solved': {}}
+    # Evaluate students concurrently using official contest metadata
+    results = evaluate_students(
+        students,
+        contest_slug=contest_slug,
+        contest_problems=contest_problems,
+        contest_start_ts=contest_start_ts,
+        contest_end_ts=contest_end_ts,
+        max_workers=config.get('eval_workers', DEFAULT_EVAL_WORKERS)
+    )
     
-    for idx, student in enumerate(students, 1):
-        name = student['name']
-        leetcode_id = student['leetcode_id']
-        
-        logger.info(f"[{idx}/{len(students)}] Processing: {name} ({leetcode_id})")
-        
-        # Evaluate student submissions using official contest metadata
-        # The function will automatically fetch start_time and duration from LeetCode API
-        result = evaluate_student_submissions(
-            leetcode_id=leetcode_id,
-            contest_slug=contest_slug,
-            contest_problems=contest_problems,
-            contest_start_ts=contest_start_ts,
-            contest_end_ts=contest_end_ts
-        )
-        
-        results.append(result)
-        
-        # Update statistics
-        if result == 'N/A':
-            stats['N/A'] += 1
-        elif result == '0':
-            stats['0'] += 1
-        elif result == 'INVALID ID':
-            stats['INVALID ID'] += 1
-        else:
-            solved_count = int(result)
-            stats['solved'][solved_count] = stats['solved'].get(solved_count, 0) + 1
-        
-        logger.info(f"  Result: {result}")
-        
-        # Add small delay between students to prevent rate limiting
-        if idx < len(students):
-            time.sleep(0.5)
+    stats = summarize_results(results)
     
     logger.info("-" * 70)
     
     # Step 4: Write results to sheet
     if dry_run:
         logger.info("Step 4: DRY RUN - Results that would be written:")
-        for idx, (student, result) in enumerate(zip(students, results), 1):
-            logger.info(f"  Row {student['row']}: {student['name']} -> {result}")
+        for student, result in zip(students, results):
+            logger.info("  Row %s: %s -> %s", student['row'], student['name'], result)
     else:
         logger.info("Step 4: Writing results to Google Sheets...")
         sheets_handler.write_contest_results(
             contest_display_name=contest_display_name,
-            results=results,
+            results=[result.to_cell() for result in results],
             students=students  # Pass students for row-aligned writing
         )
         logger.info("Results written successfully")
@@ -176,16 +150,18 @@ def run_pipeline(config: Dict, dry_run: bool = False) -> None:
     logger.info("-" * 70)
     
     # Step 5: Print summary
-    logger.info("Pipeline Summary:")
-    logger.info(f"  Total students processed: {len(students)}")
-    logger.info(f"  N/A (no submissions): {stats['N/A']}")
-    logger.info(f"  0 (attempted, none accepted): {stats['0']}")
-    logger.info(f"  INVALID ID: {stats['INVALID ID']}")
-    
+    lines = [
+        "Pipeline Summary:",
+        f"  Total students processed: {len(students)}",
+        f"  N/A (no submissions): {stats['N/A']}",
+        f"  0 (attempted, none accepted): {stats['0']}",
+        f"  INVALID ID: {stats['INVALID ID']}"
+    ]
     if stats['solved']:
-        logger.info("  Solved distribution:")
-        for count in sorted(stats['solved'].keys()):
-            logger.info(f"    {count} problem(s) solved: {stats['solved'][count]} students")
+        lines.append("  Solved distribution:")
+        lines.extend(f"    {count} problem(s) solved: {students_count} students"
+                     for count, students_count in sorted(stats['solved'].items()))
+    logger.info("\n".join(lines))
     
     logger.info("=" * 70)
     logger.info("Pipeline completed successfully!")
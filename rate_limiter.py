@@ -0,0 +1,42 @@
+"""
+Rate Limiter - Thread-safe token bucket shared by the HTTP clients
+
+Standard library only, so any module can pace its requests without pulling
+in the rest of the pipeline.
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+    
+    Allows bursts of up to `burst` calls, then paces callers to `rate` calls
+    per second. Share one instance between worker threads so their combined
+    request rate stays polite no matter how many run in parallel.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) / self.rate
+            
+            time.sleep(wait)
@@ -9,71 +9,204 @@ Runs the fraud detection pipeline automatically:
 Note: Railway deployment uses US East (Virginia) timezone = UTC-5
 """
 
+import functools
 import json
 import logging
+import sqlite3
+import threading
 import time
 from datetime import datetime, timedelta, timezone
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from pathlib import Path
-from typing import Dict, Optional
-import subprocess
-import sys
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from contest_detector import get_recent_contests
-from contest_fetcher import fetch_contest_problems
-from submissions_parser import evaluate_student_submissions
-from sheets_handler import SheetsHandler
+from json_utils import load_json
+
+# Heavy pipeline modules (requests, cloudscraper, gspread, google-auth) are
+# imported inside the functions that use them, so the scheduler starts fast
+# and only pays for what a given trigger actually needs
+if TYPE_CHECKING:
+    from sheets_handler import SheetsHandler
 
 
 # Configure logging
+# File output is buffered: records are written in batches of 200 (or as soon
+# as an ERROR arrives, and at interpreter exit) instead of one write per line
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+_log_file_handler = RotatingFileHandler('scheduler.log', maxBytes=10_000_000, backupCount=5, delay=True)
+_log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('scheduler.log'),
+        MemoryHandler(capacity=200, flushLevel=logging.ERROR, target=_log_file_handler),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
+
+try:
+    IST = ZoneInfo("Asia/Kolkata")
+except ZoneInfoNotFoundError:
+    # No tz database on the host; IST has no DST so a fixed offset is exact
+    IST = timezone(timedelta(hours=5, minutes=30), "IST")
+
+# Trigger times (IST): (weekday or None for daily, hour, minute)
+DAILY_STATS_TRIGGER = (None, 12, 0)
+WEEKLY_TRIGGER = (6, 9, 34)  # Sunday
+BIWEEKLY_TRIGGER = (5, 21, 34)  # Saturday
+MAX_SLEEP_SECONDS = 3600  # Re-plan at least hourly (clock changes, suspend)
+STATS_UPDATE_TIMEOUT = 600  # seconds
+# Contest trigger windows span two minutes (e.g. 9:34-9:35); a run that fails
+# at the first minute gets one more attempt at the second
+TRIGGER_RETRY_DELAY = timedelta(minutes=1)
+
+
+def ttl_cache(ttl_seconds: float, cache_if: Optional[Callable[[Any], bool]] = None) -> Callable:
+    """
+    Memoize a function's results for ttl_seconds (cache-aside).
+    
+    Entries are keyed on the call arguments; calls with unhashable arguments
+    bypass the cache. Exceptions are not cached, and neither are results for
+    which cache_if (if given) returns False, so failed or partial lookups are
+    retried on the next call. Entries expire ttl_seconds after the call
+    started, however long it took. Hit/miss counts are logged at DEBUG level
+    and exposed as wrapper.cache_stats; wrapper.cache_clear() drops all entries.
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = {}
+        lock = threading.Lock()
+        stats = {'hits': 0, 'misses': 0}
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = (args, tuple(sorted(kwargs.items())))
+                hash(key)
+            except TypeError:
+                return func(*args, **kwargs)
+            
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+                if entry and entry[0] > now:
+                    stats['hits'] += 1
+                    logger.debug(f"{func.__name__} cache hit ({stats['hits']} hits, {stats['misses']} misses)")
+                    return entry[1]
+                stats['misses'] += 1
+            
+            logger.debug(f"{func.__name__} cache miss ({stats['hits']} hits, {stats['misses']} misses)")
+            value = func(*args, **kwargs)
+            
+            if cache_if is None or cache_if(value):
+                with lock:
+                    cache[key] = (now + ttl_seconds, value)
+            return value
+        
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+        
+        wrapper.cache_stats = stats
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    
+    return decorator
+
+
+# Repeated calls within one scheduler tick (or across nearby ticks) return
+# identical data, so serve them from memory instead of the network
+@ttl_cache(60, cache_if=lambda contests: all(contests.values()))
+def get_recent_contests(include_upcoming: bool = False) -> Dict:
+    """Cached contest_detector.get_recent_contests."""
+    from contest_detector import get_recent_contests as _get_recent_contests
+    return _get_recent_contests(include_upcoming)
+
+
+@ttl_cache(300, cache_if=bool)
+def fetch_contest_problems(contest_slug: str, manual_problems: List[str] = None) -> List[str]:
+    """Cached contest_fetcher.fetch_contest_problems."""
+    from contest_fetcher import fetch_contest_problems as _fetch_contest_problems
+    return _fetch_contest_problems(contest_slug, manual_problems)
+
+
 class ContestStatusTracker:
-    """Track which contests have been processed to prevent duplicates."""
-    def __init__(self, status_file: str = "contest_status.json"):
-        self.status_file = Path(status_file)
-        self.status = self._load_status()
-    
-    def _load_status(self) -> Dict:
-        """Load existing status from disk."""
-        if self.status_file.exists():
+    """
+    Track which contests have been processed to prevent duplicates.
+    
+    State lives in a small SQLite database in WAL mode, so each mark is a
+    single-row write instead of a full-file rewrite, and concurrent trigger
+    handlers cannot clobber each other's updates.
+    """
+    def __init__(self, db_file: str = "contest_status.db",
+                 legacy_status_file: str = "contest_status.json"):
+        self.db_file = Path(db_file)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_file), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS processed (slug TEXT PRIMARY KEY, ts INTEGER)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, val TEXT)")
+        self._migrate_legacy_status(Path(legacy_status_file))
+    
+    def _migrate_legacy_status(self, legacy_file: Path):
+        """Import contest_status.json from older versions into an empty database."""
+        if not legacy_file.exists():
+            return
+        
+        with self._lock:
+            has_rows = self._conn.execute(
+                "SELECT 1 FROM processed UNION ALL SELECT 1 FROM kv LIMIT 1"
+            ).fetchone()
+            if has_rows:
+                return
+            
             try:
-                with open(self.status_file, 'r') as f:
-                    return json.load(f)
+                status = load_json(legacy_file)
+                processed = [
+                    (slug, int(info.get('processed_at', 0)))
+                    for slug, info in status.get('processed_contests', {}).items()
+                ]
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    self._conn.executemany("INSERT OR REPLACE INTO processed VALUES (?, ?)", processed)
+                    if status.get('last_stats_update'):
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO kv VALUES ('last_stats_update', ?)",
+                            (status['last_stats_update'],)
+                        )
+                logger.info(f"Migrated {len(processed)} processed contests from {legacy_file}")
             except Exception as e:
-                logger.error(f"Failed to load status file: {e}")
-                return {"processed_contests": {}}
-        return {"processed_contests": {}}
+                logger.error(f"Failed to migrate status file: {e}")
+    
+    def _get_value(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT val FROM kv WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
     
-    def _save_status(self):
-        """Save status to disk."""
+    def _set_value(self, key: str, value: str):
         try:
-            with open(self.status_file, 'w') as f:
-                json.dump(self.status, f, indent=2)
-        except Exception as e:
-            logger.error(f"Failed to save status file: {e}")
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO kv VALUES (?, ?)", (key, value))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save status: {e}")
     
     def is_processed(self, contest_slug: str) -> bool:
         """Check if contest has already been processed."""
-        return contest_slug in self.status['processed_contests']
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM processed WHERE slug = ?", (contest_slug,)).fetchone()
+        return row is not None
     
     def is_stats_updated_today(self) -> bool:
         """Check if daily stats have been updated today."""
-        last_update = self.status.get('last_stats_update', '')
+        last_update = self._get_value('last_stats_update') or ''
         today = datetime.now().strftime('%Y-%m-%d')
         return last_update == today
     
     def mark_stats_updated(self):
         """Mark daily stats as updated for today."""
         today = datetime.now().strftime('%Y-%m-%d')
-        self.status['last_stats_update'] = today
-        self._save_status()
+        self._set_value('last_stats_update', today)
         logger.info(f"Marked stats updated for {today}")
     
     def mark_processed(self, contest_slug: str, timestamp: int = None):
@@ -81,11 +214,12 @@ class ContestStatusTracker:
         if timestamp is None:
             timestamp = int(time.time())
         
-        self.status['processed_contests'][contest_slug] = {
-            'processed_at': timestamp,
-            'processed_time': datetime.fromtimestamp(timestamp).isoformat()
-        }
-        self._save_status()
+        try:
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO processed VALUES (?, ?)", (contest_slug, timestamp))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save status: {e}")
+            return
         logger.info(f"Marked {contest_slug} as processed")
 
 
@@ -102,87 +236,129 @@ class ContestScheduler:
         self.config_path = config_path
         self.config = self._load_config()
         self.status_tracker = ContestStatusTracker()
+        self._sheets = None  # Shared SheetsHandler, created on first use
+        self._stats_worker = None  # Last daily stats thread (may outlive its timeout)
     
     def _load_config(self) -> Dict:
         """Load configuration from file."""
         try:
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
+            return load_json(self.config_path)
         except Exception as e:
             logger.error(f"Failed to load config: {e}")
             return {}
     
+    def _get_sheets_handler(self) -> "SheetsHandler":
+        """
+        Return the shared SheetsHandler, authenticating on first use.
+        
+        Reusing it across contest runs avoids re-reading the service account,
+        re-signing the OAuth JWT and re-opening the spreadsheet every time.
+        """
+        if self._sheets is None:
+            from sheets_handler import SheetsHandler
+            self._sheets = SheetsHandler(
+                self.config['sheet_id'],
+                self.config['sheet_name'],
+                self.config['service_account_file']
+            )
+        return self._sheets
+    
     def get_current_time_ist(self) -> datetime:
-        """Get current time in IST, accounting for Railway's timezone."""
+        """Get current time in IST (timezone-aware), independent of the server's timezone."""
         # Railway servers run on US East (UTC-5 or UTC-4 during DST)
-        # To get IST time: convert local time to UTC, then add IST offset
-        now_local = datetime.now()
-        now_utc = datetime.now(timezone.utc)
-        now_ist = now_utc + timedelta(hours=5, minutes=30)
-        return now_ist.replace(tzinfo=None)  # Remove timezone for comparison
+        return datetime.now(IST)
     
-    def is_weekly_trigger_time(self) -> bool:
+    @staticmethod
+    def _next_occurrence(now_ist: datetime, trigger: tuple) -> datetime:
+        """Next IST datetime strictly after now_ist matching (weekday, hour, minute)."""
+        weekday, hour, minute = trigger
+        candidate = now_ist.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        
+        if weekday is not None:
+            candidate += timedelta(days=(weekday - now_ist.weekday()) % 7)
+        
+        if candidate <= now_ist:
+            candidate += timedelta(days=1 if weekday is None else 7)
+        
+        return candidate
+    
+    def _next_daily(self, now_ist: datetime) -> datetime:
+        """Next daily stats trigger (12:00 PM IST)."""
+        return self._next_occurrence(now_ist, DAILY_STATS_TRIGGER)
+    
+    def _next_weekly(self, now_ist: datetime) -> datetime:
+        """Next weekly contest trigger (Sunday 9:34 AM IST)."""
+        return self._next_occurrence(now_ist, WEEKLY_TRIGGER)
+    
+    def _next_biweekly(self, now_ist: datetime) -> datetime:
+        """Next possible biweekly contest trigger (Saturday 9:34 PM IST)."""
+        return self._next_occurrence(now_ist, BIWEEKLY_TRIGGER)
+    
+    def is_weekly_trigger_time(self, now_ist: Optional[datetime] = None) -> bool:
         """
         Check if current time is weekly contest trigger time.
         Weekly: Sunday 9:34 AM IST (4 minutes after 9:30 AM contest end)
-        """
-        now_ist = self.get_current_time_ist()
-        
-        # Check if it's Sunday (weekday 6)
-        if now_ist.weekday() != 6:
-            return False
         
-        # Check if it's between 9:34 AM and 9:35 AM IST
-        if now_ist.hour == 9 and 34 <= now_ist.minute <= 35:
-            return True
+        Args:
+            now_ist: Current IST time (computed once per tick by the caller)
+        """
+        if now_ist is None:
+            now_ist = self.get_current_time_ist()
         
-        return False
+        # Sunday (weekday 6), between 9:34 AM and 9:35 AM IST
+        return now_ist.weekday() == 6 and now_ist.hour == 9 and 34 <= now_ist.minute <= 35
     
-    def is_biweekly_trigger_time(self) -> bool:
+    def is_biweekly_trigger_time(self, now_ist: Optional[datetime] = None) -> bool:
         """
         Check if current time is biweekly contest trigger time.
         Biweekly: Saturday 9:34 PM IST (4 minutes after 9:30 PM contest end)
         Only triggers on alternate Saturdays when biweekly contest actually happens.
-        """
-        now_ist = self.get_current_time_ist()
         
-        # Check if it's Saturday (weekday 5)
-        if now_ist.weekday() != 5:
-            return False
+        Args:
+            now_ist: Current IST time (computed once per tick by the caller)
+        """
+        if now_ist is None:
+            now_ist = self.get_current_time_ist()
         
-        # Check if it's between 9:34 PM and 9:35 PM IST
-        if now_ist.hour == 21 and 34 <= now_ist.minute <= 35:
-            # Check if there's actually a biweekly contest today by checking recent contests
-            try:
-                recent = get_recent_contests()
-                biweekly = recent.get('biweekly')
-                if biweekly:
-                    # Check if the biweekly contest ended recently (within last 2 hours)
-                    contest_end = biweekly.get('end_time', 0)
-                    time_since_end = time.time() - contest_end
-                    # Should be between 4 minutes and 2 hours after contest end
-                    if 240 <= time_since_end <= 7200:  # 4 min to 2 hours
-                        return True
-            except Exception as e:
-                logger.error(f"Error checking biweekly contest: {e}")
+        # The cheap clock checks gate the contest lookup below
+        if not self._is_biweekly_window(now_ist):
             return False
         
+        # Check if there's actually a biweekly contest today by checking recent contests
+        try:
+            recent = get_recent_contests()
+            biweekly = recent.get('biweekly')
+            return bool(biweekly) and self._ended_recently(biweekly)
+        except Exception as e:
+            logger.error(f"Error checking biweekly contest: {e}")
         return False
     
-    def is_daily_stats_trigger_time(self) -> bool:
+    @staticmethod
+    def _is_biweekly_window(now_ist: datetime) -> bool:
+        """Saturday (weekday 5), between 9:34 PM and 9:35 PM IST."""
+        return now_ist.weekday() == 5 and now_ist.hour == 21 and 34 <= now_ist.minute <= 35
+    
+    @staticmethod
+    def _ended_recently(contest: Dict) -> bool:
+        """Whether the contest ended between 4 minutes and 2 hours ago."""
+        time_since_end = time.time() - (contest.get('end_time') or 0)
+        return 240 <= time_since_end <= 7200
+    
+    def is_daily_stats_trigger_time(self, now_ist: Optional[datetime] = None) -> bool:
         """
         Check if current time is daily stats update trigger time.
         Daily: 12:00 PM IST (noon) - updates total problems solved and contest rating
-        """
-        now_ist = self.get_current_time_ist()
         
-        # Check if it's between 12:00 PM and 12:01 PM IST
-        if now_ist.hour == 12 and 0 <= now_ist.minute <= 1:
-            # Check if not already updated today
-            if not self.status_tracker.is_stats_updated_today():
-                return True
+        Args:
+            now_ist: Current IST time (computed once per tick by the caller)
+        """
+        if now_ist is None:
+            now_ist = self.get_current_time_ist()
         
-        return False
+        # Between 12:00 PM and 12:01 PM IST, and not already updated today
+        # (the status lookup only runs inside the window)
+        return now_ist.hour == 12 and now_ist.minute <= 1 and not self.status_tracker.is_stats_updated_today()
+    
     def process_contest(self, contest: Dict) -> bool:
         """
         Process a single contest.
@@ -197,6 +373,8 @@ class ContestScheduler:
         Returns:
             True if processing was successful
         """
+        from submissions_parser import DEFAULT_EVAL_WORKERS, evaluate_students, summarize_results
+        
         slug = contest['slug']
         title = contest['title']
         start_time = contest['start_time']
@@ -207,10 +385,13 @@ class ContestScheduler:
             logger.info(f"{slug} already processed today. Skipping.")
             return False
         
+        start_dt = datetime.fromtimestamp(start_time)
+        end_dt = datetime.fromtimestamp(end_time)
+        
         logger.info("=" * 70)
         logger.info(f"PROCESSING CONTEST: {title}")
         logger.info(f"Contest Slug: {slug}")
-        logger.info(f"Time Window: {datetime.fromtimestamp(start_time)} to {datetime.fromtimestamp(end_time)}")
+        logger.info("Time Window: %s to %s", start_dt, end_dt)
         logger.info("=" * 70)
         
         try:
@@ -235,69 +416,47 @@ class ContestScheduler:
                 logger.error("Missing Google Sheets configuration in config.json")
                 return False
             
-            sheets = SheetsHandler(sheet_id, sheet_name, service_account_file)
+            sheets = self._get_sheets_handler()
             students = sheets.read_students()
             logger.info(f"Loaded {len(students)} students from sheet")
             
             # Step 3: Evaluate submissions
             logger.info("Step 3: Evaluating student submissions...")
-            results = []
-            results_dict = {}
-            stats = {'N/A': 0, '0': 0, 'INVALID ID': 0, 'solved': {}}
+            results = evaluate_students(
+                students,
+                contest_slug=slug,
+                contest_problems=problems,
+                contest_start_ts=start_time,
+                contest_end_ts=end_time,
+                max_workers=self.config.get('eval_workers', DEFAULT_EVAL_WORKERS)
+            )
+            cells = [result.to_cell() for result in results]
+            results_dict = {student['leetcode_id']: cell for student, cell in zip(students, cells)}
             
-            for idx, student in enumerate(students, 1):
-                name = student['name']
-                leetcode_id = student['leetcode_id']
-                
-                logger.info(f"[{idx}/{len(students)}] Processing: {name} ({leetcode_id})")
-                
-                result = evaluate_student_submissions(
-                    leetcode_id=leetcode_id,
-                    contest_slug=slug,
-                    contest_problems=problems,
-                    contest_start_ts=start_time,
-                    contest_end_ts=end_time
-                )
-                
-                results.append(result)
-                results_dict[leetcode_id] = result
-                
-                # Update statistics
-                if result == 'N/A':
-                    stats['N/A'] += 1
-                elif result == '0':
-                    stats['0'] += 1
-                elif result == 'INVALID ID':
-                    stats['INVALID ID'] += 1
-                else:
-                    solved_count = int(result)
-                    stats['solved'][solved_count] = stats['solved'].get(solved_count, 0) + 1
-                
-                logger.info(f"  Result: {result}")
-                
-                # Add small delay between students to prevent rate limiting
-                if idx < len(students):
-                    time.sleep(0.5)
+            stats = summarize_results(results)
             
             # Step 4: Write results to Google Sheets
             logger.info("Step 4: Writing results to Google Sheets...")
-            sheets.write_contest_results(title, results, students)  # Pass students for row-aligned writing
+            sheets.write_contest_results(title, cells, students)  # Pass students for row-aligned writing
             logger.info("Results written successfully to Google Sheets")
             
             # Print summary
             logger.info("-" * 70)
-            logger.info("Processing Summary:")
-            logger.info(f"  Total students: {len(students)}")
-            logger.info(f"  N/A (no submissions): {stats['N/A']}")
-            logger.info(f"  0 (attempted, none accepted): {stats['0']}")
-            logger.info(f"  INVALID ID: {stats['INVALID ID']}")
+            lines = [
+                "Processing Summary:",
+                f"  Total students: {len(students)}",
+                f"  N/A (no submissions): {stats['N/A']}",
+                f"  0 (attempted, none accepted): {stats['0']}",
+                f"  INVALID ID: {stats['INVALID ID']}"
+            ]
             if stats['solved']:
-                logger.info("  Solved distribution:")
-                for count in sorted(stats['solved'].keys()):
-                    logger.info(f"    {count} problem(s): {stats['solved'][count]} students")
+                lines.append("  Solved distribution:")
+                lines.extend(f"    {count} problem(s): {students_count} students"
+                             for count, students_count in sorted(stats['solved'].items()))
+            logger.info("\n".join(lines))
             
             # Mark as processed
-            self.status_tracker.mark_processed(slug)
+            self.status_tracker.mark_processed(slug, int(time.time()))
             
             # Save backup
             self._save_results_backup(slug, title, results_dict)
@@ -331,10 +490,16 @@ class ContestScheduler:
         except Exception as e:
             logger.error(f"Failed to save backup: {e}")
     
-    def try_process_weekly(self):
-        """Try to process weekly contest if it's trigger time."""
-        if not self.is_weekly_trigger_time():
-            return
+    def try_process_weekly(self, now_ist: Optional[datetime] = None) -> Optional[bool]:
+        """
+        Try to process weekly contest if it's trigger time.
+        
+        Returns:
+            True if the contest is now processed (by this or an earlier run),
+            False if the attempt failed, None if nothing was due
+        """
+        if not self.is_weekly_trigger_time(now_ist):
+            return None
         
         logger.info("🎯 Weekly contest trigger time detected!")
         
@@ -345,20 +510,32 @@ class ContestScheduler:
             
             if not weekly:
                 logger.warning("No recent weekly contest found")
-                return
+                return False
             
             # Process the contest
-            self.process_contest(weekly)
+            return self.process_contest(weekly) or self.status_tracker.is_processed(weekly['slug'])
             
         except Exception as e:
             logger.error(f"Error processing weekly contest: {e}", exc_info=True)
+            return False
     
-    def try_process_biweekly(self):
-        """Try to process biweekly contest if it's trigger time."""
-        if not self.is_biweekly_trigger_time():
-            return
+    def try_process_biweekly(self, now_ist: Optional[datetime] = None) -> Optional[bool]:
+        """
+        Try to process biweekly contest if it's trigger time.
+        
+        Same checks as is_biweekly_trigger_time, done inline so that a failed
+        contest lookup (retried) is told apart from a Saturday without a
+        biweekly contest (nothing due).
+        
+        Returns:
+            True if the contest is now processed (by this or an earlier run),
+            False if the attempt failed, None if nothing was due
+        """
+        if now_ist is None:
+            now_ist = self.get_current_time_ist()
         
-        logger.info("🎯 Biweekly contest trigger time detected!")
+        if not self._is_biweekly_window(now_ist):
+            return None
         
         try:
             # Get most recent biweekly contest
@@ -367,48 +544,76 @@ class ContestScheduler:
             
             if not biweekly:
                 logger.warning("No recent biweekly contest found")
-                return
+                return False
+            
+            if not self._ended_recently(biweekly):
+                logger.info(f"No biweekly contest today (latest is {biweekly['slug']})")
+                return None
+            
+            logger.info("🎯 Biweekly contest trigger time detected!")
             
             # Process the contest
-            self.process_contest(biweekly)
+            return self.process_contest(biweekly) or self.status_tracker.is_processed(biweekly['slug'])
             
         except Exception as e:
             logger.error(f"Error processing biweekly contest: {e}", exc_info=True)
+            return False
     
-    def try_update_daily_stats(self):
-        """Try to update daily stats if it's trigger time."""
-        if not self.is_daily_stats_trigger_time():
-            return
+    def try_update_daily_stats(self, now_ist: Optional[datetime] = None) -> Optional[bool]:
+        """
+        Try to update daily stats if it's trigger time.
+        
+        Returns:
+            True if today's stats are updated, False if the update failed,
+            None if nothing was due (outside the window, already updated today,
+            or a previous update still running)
+        """
+        if not self.is_daily_stats_trigger_time(now_ist):
+            return None
         
         logger.info("📊 Daily stats update trigger time detected!")
         
-        try:
-            # Run update_stats.py
-            logger.info("Running update_stats.py to update LeetCode statistics...")
-            result = subprocess.run(
-                [sys.executable, 'update_stats.py'],
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 minute timeout
-            )
-            
-            if result.returncode == 0:
-                logger.info("✅ Daily stats updated successfully!")
-                logger.info(f"Output: {result.stdout}")
+        # A timed-out update cannot be killed and may still be writing D:E;
+        # never start a second one alongside it
+        if self._stats_worker is not None and self._stats_worker.is_alive():
+            logger.warning("Previous stats update is still running. Skipping this trigger.")
+            return None
+        
+        # Run the stats update in-process (no interpreter start-up or re-imports),
+        # on a worker thread so a hung update cannot block the scheduler forever
+        logger.info("Running update_stats to update LeetCode statistics...")
+        outcome = {}
+        
+        def _run_stats_update():
+            try:
+                from update_stats import update_leetcode_stats
+                update_leetcode_stats()
+                # Recorded here so an update that finishes after the timeout still counts
                 self.status_tracker.mark_stats_updated()
-            else:
-                logger.error(f"❌ Stats update failed with code {result.returncode}")
-                logger.error(f"Error: {result.stderr}")
-            
-        except subprocess.TimeoutExpired:
-            logger.error("Stats update timed out after 10 minutes")
-        except Exception as e:
-            logger.error(f"Error updating daily stats: {e}", exc_info=True)
+                outcome['ok'] = True
+            except Exception as e:
+                outcome['error'] = e
+        
+        worker = threading.Thread(target=_run_stats_update, name="daily-stats-update", daemon=True)
+        self._stats_worker = worker
+        worker.start()
+        worker.join(STATS_UPDATE_TIMEOUT)
+        
+        if worker.is_alive():
+            logger.error(f"Stats update timed out after {STATS_UPDATE_TIMEOUT // 60} minutes "
+                         f"(still running in the background)")
+        elif 'error' in outcome:
+            error = outcome['error']
+            logger.error(f"❌ Error updating daily stats: {error}", exc_info=error)
+        else:
+            logger.info("✅ Daily stats updated successfully!")
+            return True
+        return False
     
     def run(self):
         """
         Run the scheduler continuously.
-        Checks every minute for trigger times.
+        Sleeps until the next trigger time instead of polling every minute.
         """
         logger.info("=" * 70)
         logger.info("LEETCODE CONTEST SCHEDULER STARTED")
@@ -423,18 +628,45 @@ class ContestScheduler:
         logger.info("Monitoring for trigger times...")
         logger.info("=" * 70)
         
+        # Started inside a trigger window? Handle it now rather than next week
+        now_ist = self.get_current_time_ist()
+        self.try_update_daily_stats(now_ist)
+        self.try_process_weekly(now_ist)
+        self.try_process_biweekly(now_ist)
+        
+        # Second attempts (trigger + TRIGGER_RETRY_DELAY) for triggers whose
+        # first run failed (returned False, not None), while their window is still open
+        retries = []
+        
         while True:
             try:
-                now = datetime.now()
+                now_ist = self.get_current_time_ist()
+                events = [
+                    (self._next_daily(now_ist), self.try_update_daily_stats),
+                    (self._next_weekly(now_ist), self.try_process_weekly),
+                    (self._next_biweekly(now_ist), self.try_process_biweekly)
+                ]
+                next_trigger = min(trigger_time for trigger_time, _ in events + retries)
+                
+                sleep_s = max(1, (next_trigger - now_ist).total_seconds())
+                logger.debug(f"Next trigger at {next_trigger} (sleeping {sleep_s:.0f}s)")
+                time.sleep(min(sleep_s, MAX_SLEEP_SECONDS))
+                
+                # Dispatch only the triggers that are now due
+                now_ist = self.get_current_time_ist()
+                due_retries = [event for event in retries if event[0] <= now_ist]
+                retries = [event for event in retries if event[0] > now_ist]
                 
-                # Check every minute
-                if now.second < 10:  # Only check in first 10 seconds of each minute
-                    self.try_update_daily_stats()
-                    self.try_process_weekly()
-                    self.try_process_biweekly()
+                for trigger_time, handler in events:
+                    if trigger_time <= now_ist and handler(now_ist) is False:
+                        logger.info(f"{handler.__name__} failed; retrying at {trigger_time + TRIGGER_RETRY_DELAY}")
+                        # The retry must look the contest up again, not reuse this attempt's data
+                        get_recent_contests.cache_clear()
+                        fetch_contest_problems.cache_clear()
+                        retries.append((trigger_time + TRIGGER_RETRY_DELAY, handler))
                 
-                # Sleep for 50 seconds to avoid duplicate checks in same minute
-                time.sleep(50)
+                for _, handler in due_retries:
+                    handler(now_ist)
                 
             except KeyboardInterrupt:
                 logger.info("Scheduler stopped by user")
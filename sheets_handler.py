@@ -22,6 +22,68 @@ SCOPES = [
 ]
 
 
+# Authorized clients (keyed by service account file) and opened spreadsheets
+# (keyed by sheet ID), shared by every SheetsHandler in the process so the
+# credentials are loaded and the spreadsheet metadata fetched only once
+_CLIENTS: Dict[str, gspread.Client] = {}
+_SPREADSHEETS: Dict[str, gspread.Spreadsheet] = {}
+
+
+def _get_client(service_account_file: str) -> gspread.Client:
+    """
+    Return an authorized gspread client, creating it on first use.
+    Supports both local file and environment variable for cloud deployment.
+    
+    Args:
+        service_account_file: Path to service account JSON file (used locally)
+    """
+    client = _CLIENTS.get(service_account_file)
+    if client is not None:
+        return client
+    
+    # Initialize Google Sheets client
+    logger.info("Authenticating with Google Sheets API...")
+    
+    # Check if running in cloud (environment variable exists)
+    service_json_env = os.getenv('SERVICE_JSON')
+    
+    if service_json_env:
+        # Running in cloud - use environment variable
+        logger.info("Using SERVICE_JSON from environment variable")
+        import json
+        credentials_dict = json.loads(service_json_env)
+        credentials = Credentials.from_service_account_info(
+            credentials_dict,
+            scopes=SCOPES
+        )
+    else:
+        # Running locally - use file
+        logger.info("Using service account file from disk")
+        if not os.path.exists(service_account_file):
+            raise FileNotFoundError(
+                f"Service account file not found: {service_account_file}\n"
+                "Please create this file with your Google service account credentials."
+            )
+        credentials = Credentials.from_service_account_file(
+            service_account_file,
+            scopes=SCOPES
+        )
+    
+    client = gspread.authorize(credentials)
+    _CLIENTS[service_account_file] = client
+    return client
+
+
+def _get_spreadsheet(client: gspread.Client, sheet_id: str) -> gspread.Spreadsheet:
+    """Return the opened spreadsheet for sheet_id, opening it on first use."""
+    spreadsheet = _SPREADSHEETS.get(sheet_id)
+    if spreadsheet is None:
+        logger.info(f"Opening spreadsheet: {sheet_id}")
+        spreadsheet = client.open_by_key(sheet_id)
+        _SPREADSHEETS[sheet_id] = spreadsheet
+    return spreadsheet
+
+
 class SheetsHandler:
     """Handle all Google Sheets operations."""
     
@@ -39,41 +101,25 @@ class SheetsHandler:
         self.sheet_name = sheet_name
         self.service_account_file = service_account_file
         
-        # Initialize Google Sheets client
-        logger.info("Authenticating with Google Sheets API...")
-        
-        # Check if running in cloud (environment variable exists)
-        service_json_env = os.getenv('SERVICE_JSON')
-        
-        if service_json_env:
-            # Running in cloud - use environment variable
-            logger.info("Using SERVICE_JSON from environment variable")
-            import json
-            credentials_dict = json.loads(service_json_env)
-            self.credentials = Credentials.from_service_account_info(
-                credentials_dict,
-                scopes=SCOPES
-            )
-        else:
-            # Running locally - use file
-            logger.info("Using service account file from disk")
-            if not os.path.exists(service_account_file):
-                raise FileNotFoundError(
-                    f"Service account file not found: {service_account_file}\n"
-                    "Please create this file with your Google service account credentials."
-                )
-            self.credentials = Credentials.from_service_account_file(
-                service_account_file,
-                scopes=SCOPES
-            )
-        
-        self.client = gspread.authorize(self.credentials)
+        self.client = _get_client(service_account_file)
         
         # Open the spreadsheet and worksheet
-        logger.info(f"Opening spreadsheet: {sheet_id}")
-        self.spreadsheet = self.client.open_by_key(sheet_id)
+        self.spreadsheet = _get_spreadsheet(self.client, sheet_id)
         self.worksheet = self.spreadsheet.worksheet(sheet_name)
         logger.info(f"Connected to sheet: {sheet_name}")
+        
+        # Header row as of the last read_students() call (None until then),
+        # plus a name -> 1-based column index map kept in sync with it
+        self._header_row: Optional[List[str]] = None
+        self._header_index: Dict[str, int] = {}
+    
+    def _set_header_row(self, header_row: List[str]) -> None:
+        """Cache the header row and rebuild the column index (first occurrence wins)."""
+        self._header_row = header_row
+        self._header_index = {}
+        for col_index, name in enumerate(header_row, start=1):
+            if name:
+                self._header_index.setdefault(name, col_index)
     
     def read_students(self) -> List[Dict[str, str]]:
         """
@@ -90,22 +136,21 @@ class SheetsHandler:
         """
         logger.info("Reading student data from sheet...")
         
-        # Get all values from the sheet
-        all_values = self.worksheet.get_all_values()
+        # One request for the full header row (needed to locate contest
+        # columns) and columns A:C of the data rows; the historical contest
+        # result columns are never transferred
+        header_range, data_rows = self.worksheet.batch_get(['1:1', 'A2:C'])
+        self._set_header_row(header_range[0] if header_range else [])
         
-        if not all_values:
+        if not header_range and not data_rows:
             logger.warning("Sheet is empty")
             return []
         
-        # Skip header row (index 0)
-        data_rows = all_values[1:]
-        
         students = []
         for idx, row in enumerate(data_rows, start=2):  # Start at row 2 (after header)
-            # Ensure row has at least 3 columns
+            # The API trims trailing empty cells; pad to columns A:C
             if len(row) < 3:
-                logger.warning(f"Row {idx} has insufficient columns, skipping")
-                continue
+                row = row + [''] * (3 - len(row))
             
             name = row[1].strip()  # Column B: Name
             leetcode_id = row[2].strip()  # Column C: Leet Code ID
@@ -137,16 +182,16 @@ class SheetsHandler:
         Returns:
             Column index (1-based) where results should be written
         """
-        # Get header row
-        header_row = self.worksheet.row_values(1)
+        # Get header row (cached by read_students, otherwise fetched)
+        if self._header_row is None:
+            self._set_header_row(self.worksheet.row_values(1))
+        header_row = self._header_row
         
         # Check if contest column already exists
-        try:
-            col_index = header_row.index(contest_display_name) + 1  # 1-based index
+        col_index = self._header_index.get(contest_display_name)
+        if col_index is not None:
             logger.info(f"Found existing contest column at index {col_index}: '{contest_display_name}'")
             return col_index
-        except ValueError:
-            pass
         
         # Contest column doesn't exist - create new column at the end
         num_cols = len(header_row)
@@ -156,6 +201,8 @@ class SheetsHandler:
         
         # Write header to new column
         self.worksheet.update_cell(1, new_col_index, contest_display_name)
+        header_row.append(contest_display_name)
+        self._header_index[contest_display_name] = new_col_index
         
         return new_col_index
     
@@ -176,30 +223,23 @@ class SheetsHandler:
         # Convert column index to letter (A, B, C, ... AA, AB, ...)
         col_letter = self._col_index_to_letter(col_index)
         
+        if not results:
+            logger.info("No results to write")
+            return
+        
         if students and len(students) == len(results):
             # Write to exact rows using student row numbers
-            # Build batch update with specific cells
-            cells_to_update = []
-            for student, result in zip(students, results):
-                row_num = student['row']
-                cells_to_update.append({
-                    'range': f"{col_letter}{row_num}",
-                    'values': [[result]]
-                })
-            
+            rows = [student['row'] for student in students]
             logger.info(f"Writing {len(results)} results to column {col_letter} (row-aligned)")
-            
-            # Batch update all cells
-            self.worksheet.batch_update(cells_to_update)
         else:
             # Fallback: Write sequentially starting from row 2
-            start_row = 2
-            end_row = start_row + len(results) - 1
-            range_name = f"{col_letter}{start_row}:{col_letter}{end_row}"
-            values = [[result] for result in results]
-            
-            logger.info(f"Writing {len(results)} results to range {range_name}")
-            self.worksheet.update(range_name, values)
+            rows = range(2, 2 + len(results))
+            logger.info(f"Writing {len(results)} results to column {col_letter} from row 2")
+        
+        # update_cells sends one values.update over the cells' bounding range;
+        # rows without a cell (skipped students) are left untouched
+        cells = [gspread.Cell(row=row, col=col_index, value=result) for row, result in zip(rows, results)]
+        self.worksheet.update_cells(cells, value_input_option='RAW')
         
         logger.info("Results written successfully")
     
@@ -214,9 +254,20 @@ class SheetsHandler:
             27 -> AA
             52 -> AZ
         """
-        result = ""
-        while col_index > 0:
-            col_index -= 1
-            result = chr(col_index % 26 + ord('A')) + result
-            col_index //= 26
-        return result
\ No newline at end of file
+        if 0 < col_index < len(_COL_LETTERS):
+            return _COL_LETTERS[col_index]
+        return _index_to_letter(col_index)
+
+
+def _index_to_letter(col_index: int) -> str:
+    """Convert a 1-based column index to letter(s) arithmetically."""
+    result = ""
+    while col_index > 0:
+        col_index -= 1
+        result = chr(col_index % 26 + ord('A')) + result
+        col_index //= 26
+    return result
+
+
+# Column letters for indexes 1..702 (A..ZZ), precomputed once; index 0 unused
+_COL_LETTERS = ("",) + tuple(_index_to_letter(i) for i in range(1, 703))
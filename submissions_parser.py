@@ -5,12 +5,21 @@ Uses official LeetCode contest metadata (start_time, duration) to determine
 if submissions were made during the actual contest window.
 """
 
+import functools
 import logging
+import threading
 import time
-from typing import List, Dict
+from collections import Counter
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Iterable, List, Dict, Optional, Tuple
 
 import requests
 
+from http_session import create_retrying_session, mount_retrying_adapter
+from json_utils import parse_json
+from rate_limiter import RateLimiter
+
 try:
     import cloudscraper
     CLOUDSCRAPER_AVAILABLE = True
@@ -29,15 +38,111 @@ SUBMISSIONS_API_ENDPOINTS = [
 LEETCODE_CONTEST_API = "https://leetcode.com/contest/api/info"
 MAX_RETRIES = 3
 RETRY_DELAY = 3  # seconds (increased to avoid rate limits)
+DEFAULT_EVAL_WORKERS = 10  # Students evaluated concurrently
 
-# Global counter to rotate through API endpoints
+# Global counter to rotate through API endpoints (shared by worker threads)
 _api_endpoint_index = 0
+_api_endpoint_lock = threading.Lock()
+
+RATE_LIMIT_PER_SEC = 10  # Sustained submissions API requests per second
+RATE_LIMIT_BURST = 20  # Requests allowed back-to-back before throttling
+
+_RATE_LIMITER = RateLimiter(rate=RATE_LIMIT_PER_SEC, burst=RATE_LIMIT_BURST)
+
+# Cloudflare-capable client for leetcode.com; expensive to build, so it is
+# created on first use (see _get_scraper) and then reused
+_SCRAPER = None
+_SCRAPER_LOCK = threading.Lock()
+
+# In-flight submission fetches keyed by leetcode_id (see _submit_fetch)
+_inflight_fetches: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# One keep-alive session shared by every student evaluation, so concurrent
+# workers reuse pooled connections to the submissions API hosts; retries
+# happen in the adapter (see http_session) and are charged to _RATE_LIMITER
+_SESSION = create_retrying_session(
+    pool_connections=len(SUBMISSIONS_API_ENDPOINTS),
+    pool_maxsize=DEFAULT_EVAL_WORKERS,
+    rate_limiter=_RATE_LIMITER,
+    total_retries=MAX_RETRIES
+)
+_SESSION.headers["User-Agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+_session_pool_maxsize = DEFAULT_EVAL_WORKERS
+_session_pool_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class EvalResult:
+    """
+    Outcome of evaluating one student for one contest.
+    
+    status is "OK" (count = unique problems accepted, possibly 0), "N/A" (no
+    submissions during the contest) or "INVALID" (unknown LeetCode ID); count
+    is None unless status is "OK". Converted to the sheet's display strings
+    only at the write boundary via to_cell().
+    """
+    count: Optional[int]
+    status: str
+    
+    def to_cell(self) -> str:
+        """Display value written to the sheet: "N/A", "INVALID ID" or the count."""
+        if self.status == "N/A":
+            return "N/A"
+        if self.status == "INVALID":
+            return "INVALID ID"
+        return str(self.count)
+    
+    def __str__(self) -> str:
+        return self.to_cell()
+
+
+RESULT_NA = EvalResult(None, "N/A")
+RESULT_INVALID = EvalResult(None, "INVALID")
+
+
+def _ensure_session_pool(max_workers: int) -> None:
+    """
+    Grow _SESSION's per-host connection pool to cover max_workers.
+    
+    With more workers than pooled connections, urllib3 discards the surplus
+    connections after each request ("Connection pool is full"), which defeats
+    keep-alive. The pool only ever grows, so a smaller run keeps the bigger one.
+    """
+    global _session_pool_maxsize
+    with _session_pool_lock:
+        if max_workers <= _session_pool_maxsize:
+            return
+        mount_retrying_adapter(
+            _SESSION,
+            pool_connections=len(SUBMISSIONS_API_ENDPOINTS),
+            pool_maxsize=max_workers,
+            rate_limiter=_RATE_LIMITER,
+            total_retries=MAX_RETRIES
+        )
+        _session_pool_maxsize = max_workers
+        logger.debug(f"Resized submissions connection pool to {max_workers}")
+
+
+def _get_scraper():
+    """Return the shared cloudscraper instance, creating it on first use."""
+    global _SCRAPER
+    if _SCRAPER is None:
+        with _SCRAPER_LOCK:
+            if _SCRAPER is None:
+                _SCRAPER = cloudscraper.create_scraper()
+    return _SCRAPER
 
 
+@functools.lru_cache(maxsize=32)
 def fetch_contest_metadata(contest_slug: str) -> Dict:
     """
     Fetch official contest metadata including start_time and duration.
     
+    Results are cached per contest_slug for the life of the process (failures
+    are not cached); see clear_contest_cache(). Callers evaluating many
+    students should still fetch once and pass the values through.
+    
     Args:
         contest_slug: Contest identifier (e.g., "weekly-contest-477")
     
@@ -50,15 +155,14 @@ def fetch_contest_metadata(contest_slug: str) -> Dict:
         try:
             # Use cloudscraper to bypass Cloudflare
             if CLOUDSCRAPER_AVAILABLE:
-                scraper = cloudscraper.create_scraper()
-                response = scraper.get(url, timeout=15)
+                response = _get_scraper().get(url, timeout=15)
             else:
                 response = requests.get(url, timeout=15)
             
             if response.status_code != 200:
                 raise RuntimeError(f"API returned {response.status_code}")
             
-            data = response.json()
+            data = parse_json(response)
             
             # Extract from nested 'contest' object
             contest_info = data.get('contest', {})
@@ -88,6 +192,11 @@ def fetch_contest_metadata(contest_slug: str) -> Dict:
     raise RuntimeError("Failed after all retries")
 
 
+def clear_contest_cache() -> None:
+    """Drop cached contest metadata (for long-running processes)."""
+    fetch_contest_metadata.cache_clear()
+
+
 def fetch_user_submissions(leetcode_id: str):
     """
     Fetch all submissions for a user from the deployed API.
@@ -107,23 +216,22 @@ def fetch_user_submissions(leetcode_id: str):
     """
     global _api_endpoint_index
     
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    }
-    
-    # Retry loop with round-robin API endpoints and exponential backoff
-    for attempt in range(1, MAX_RETRIES + 1):
+    # One attempt per endpoint, round-robin; backoff/retries happen in the adapter
+    attempts = len(SUBMISSIONS_API_ENDPOINTS)
+    for attempt in range(1, attempts + 1):
         # Select API endpoint in round-robin fashion
-        api_base = SUBMISSIONS_API_ENDPOINTS[_api_endpoint_index % len(SUBMISSIONS_API_ENDPOINTS)]
-        _api_endpoint_index += 1
+        with _api_endpoint_lock:
+            api_base = SUBMISSIONS_API_ENDPOINTS[_api_endpoint_index % len(SUBMISSIONS_API_ENDPOINTS)]
+            _api_endpoint_index += 1
         
         url = f"{api_base}/{leetcode_id}/submission"
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            _RATE_LIMITER.acquire()
+            response = _SESSION.get(url, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = parse_json(response)
             
             # Check for invalid user - API returns {"count":0,"submission":[]} for invalid IDs
             # Valid users have count > 0 or at least some submission data
@@ -143,61 +251,31 @@ def fetch_user_submissions(leetcode_id: str):
             logger.debug(f"Fetched {len(submissions)} submissions for {leetcode_id} from {api_base}")
             return submissions
             
-        except requests.exceptions.Timeout:
-            logger.warning(f"Timeout fetching submissions for {leetcode_id} from {api_base} (attempt {attempt}/{MAX_RETRIES})")
-            
-            if attempt < MAX_RETRIES:
-                delay = RETRY_DELAY * (2 ** (attempt - 1))
-                time.sleep(delay)
-            else:
-                logger.error(f"Failed to fetch submissions for {leetcode_id}: Timeout")
-                return []
-        
         except requests.exceptions.RequestException as e:
-            logger.warning(f"Request error for {leetcode_id} from {api_base}: {e} (attempt {attempt}/{MAX_RETRIES})")
-            
-            if attempt < MAX_RETRIES:
-                delay = RETRY_DELAY * (2 ** (attempt - 1))
-                time.sleep(delay)
-            else:
-                logger.error(f"Failed to fetch submissions for {leetcode_id}: {e}")
-                return []
+            # Retries against this endpoint are exhausted; fail over to the next one
+            logger.warning(f"Request error for {leetcode_id} from {api_base}: {e} (attempt {attempt}/{attempts})")
         
         except Exception as e:
             logger.error(f"Unexpected error fetching submissions for {leetcode_id}: {e}")
             return []
     
+    logger.error(f"Failed to fetch submissions for {leetcode_id}: all endpoints failed")
     return []
 
 
-def evaluate_student_submissions(
-    leetcode_id: str,
+def _resolve_contest_metadata(
     contest_slug: str,
     contest_problems: List[str] = None,
     contest_start_ts: int = None,
     contest_end_ts: int = None
-) -> str:
+) -> Tuple[Optional[List[str]], Optional[int], Optional[int]]:
     """
-    Evaluate a student's contest performance using official contest metadata.
-    
-    Args:
-        leetcode_id: LeetCode username
-        contest_slug: Contest identifier (e.g., "weekly-contest-477")
-        contest_problems: Optional pre-defined list (will fetch if not provided)
-        contest_start_ts: Optional start timestamp (will fetch if not provided)
-        contest_end_ts: Optional end timestamp (will fetch if not provided)
+    Fill in missing contest problems/window from official LeetCode metadata.
     
     Returns:
-        "N/A" if no submissions during contest period
-        "0" if submitted but none accepted
-        "{k}" where k is number of unique problems solved
-    
-    Note:
-        If contest_problems/timestamps are not provided, this function will
-        fetch official contest metadata from LeetCode API to get accurate
-        start_time and duration for strict verification.
+        (contest_problems, contest_start_ts, contest_end_ts); contest_problems
+        is None if it was not provided and could not be fetched
     """
-    # If metadata not provided, fetch it from LeetCode API
     if contest_problems is None or contest_start_ts is None or contest_end_ts is None:
         try:
             metadata = fetch_contest_metadata(contest_slug)
@@ -207,65 +285,258 @@ def evaluate_student_submissions(
             logger.debug(f"Using official contest window: {contest_start_ts} - {contest_end_ts}")
         except Exception as e:
             logger.error(f"Failed to fetch contest metadata: {e}")
-            # Fall back to provided values or return N/A
-            if contest_problems is None:
-                return "N/A"
     
-    # Fetch all submissions for the user
-    submissions = fetch_user_submissions(leetcode_id)
+    return contest_problems, contest_start_ts, contest_end_ts
+
+
+def score_submissions(
+    leetcode_id: str,
+    submissions: Optional[List[Dict]],
+    contest_problems: Iterable[str],
+    contest_start_ts: int,
+    contest_end_ts: int
+) -> EvalResult:
+    """
+    Score already-fetched submissions against a contest (no network access).
+    
+    Args:
+        leetcode_id: LeetCode username (for logging)
+        submissions: Result of fetch_user_submissions (None for invalid ID)
+        contest_problems: Contest problem titleSlugs (pass a frozenset when
+            scoring many students to avoid rebuilding it per call)
+        contest_start_ts: Contest start timestamp
+        contest_end_ts: Contest end timestamp
     
+    Returns:
+        Same values as evaluate_student_submissions
+    """
     # Check for invalid ID
     if submissions is None:
         logger.warning(f"Invalid LeetCode ID: {leetcode_id}")
-        return "INVALID ID"
+        return RESULT_INVALID
     
     if not submissions:
         logger.debug(f"No submissions found for {leetcode_id}")
-        return "N/A"
+        return RESULT_NA
+    
+    # Submissions come newest-first: if the newest one predates the contest,
+    # or the oldest one postdates it, none can fall inside the window
+    try:
+        newest = int(submissions[0].get('timestamp', '0'))
+        oldest = int(submissions[-1].get('timestamp', '0'))
+    except (ValueError, TypeError):
+        pass
+    else:
+        if oldest <= newest and (newest < contest_start_ts or oldest > contest_end_ts):
+            logger.debug(f"No submissions by {leetcode_id} overlap the contest window")
+            return RESULT_NA
     
     # Filter submissions:
-    # 1. Problem is in contest_problems
+    # 1. Problem is in contest_problems (cheapest and most selective, so first)
     # 2. Timestamp is within contest window (using official metadata)
     # 3. Status is "Accepted"
     
-    contest_problem_set = set(contest_problems)
-    relevant_submissions = []
+    if isinstance(contest_problems, (set, frozenset)):
+        contest_problem_set = contest_problems
+    else:
+        contest_problem_set = frozenset(contest_problems)
+    has_relevant = False
     accepted_problems = set()
     
+    # Submission timestamps arrive as fixed-width 10-digit strings (UNIX
+    # seconds, 2001-2286), which order the same as their integer values, so
+    # compare them as strings against pre-stringified bounds and only fall
+    # back to int() for anything else
+    start_s, end_s = str(contest_start_ts), str(contest_end_ts)
+    compare_as_str = len(start_s) == 10 and len(end_s) == 10 and start_s.isdigit() and end_s.isdigit()
+    
     for sub in submissions:
-        title_slug = sub.get('titleSlug', '')
-        timestamp_str = sub.get('timestamp', '0')
-        status = sub.get('statusDisplay', '')
-        
-        # Convert timestamp to int
-        try:
-            timestamp = int(timestamp_str)
-        except (ValueError, TypeError):
-            continue
-        
-        # Check if this is a contest problem
+        title_slug = sub.get('titleSlug')
         if title_slug not in contest_problem_set:
             continue
         
         # Check if submission is within official contest window
-        if not (contest_start_ts <= timestamp <= contest_end_ts):
-            continue
+        timestamp = sub.get('timestamp', '0')
+        if compare_as_str and type(timestamp) is str and len(timestamp) == 10 and timestamp.isdigit():
+            if not (start_s <= timestamp <= end_s):
+                continue
+        else:
+            try:
+                timestamp = int(timestamp)
+            except (ValueError, TypeError):
+                continue
+            if not (contest_start_ts <= timestamp <= contest_end_ts):
+                continue
         
-        # This is a relevant submission
-        relevant_submissions.append(sub)
-        
-        # Track accepted problems
-        if status == "Accepted":
+        # This is a relevant submission; track accepted problems
+        has_relevant = True
+        if sub.get('statusDisplay') == "Accepted":
             accepted_problems.add(title_slug)
     
     # Determine result
-    if not relevant_submissions:
+    if not has_relevant:
         # No submissions for contest problems during contest
-        return "N/A"
+        return RESULT_NA
+    
+    # Count of unique accepted problems (0 if submitted but none accepted)
+    return EvalResult(len(accepted_problems), "OK")
+
+
+def evaluate_student_submissions(
+    leetcode_id: str,
+    contest_slug: str,
+    contest_problems: List[str] = None,
+    contest_start_ts: int = None,
+    contest_end_ts: int = None
+) -> EvalResult:
+    """
+    Evaluate a student's contest performance using official contest metadata.
+    
+    Args:
+        leetcode_id: LeetCode username
+        contest_slug: Contest identifier (e.g., "weekly-contest-477")
+        contest_problems: Optional pre-defined list (will fetch if not provided)
+        contest_start_ts: Optional start timestamp (will fetch if not provided)
+        contest_end_ts: Optional end timestamp (will fetch if not provided)
     
-    if not accepted_problems:
-        # Submitted but none accepted
-        return "0"
+    Returns:
+        EvalResult with status "N/A" if no submissions during contest period,
+        "INVALID" for an unknown LeetCode ID, otherwise "OK" with count = the
+        number of unique problems solved (0 if submitted but none accepted)
+    
+    Note:
+        If contest_problems/timestamps are not provided, this function will
+        fetch official contest metadata from LeetCode API to get accurate
+        start_time and duration for strict verification.
+    """
+    # If metadata not provided, fetch it from LeetCode API
+    contest_problems, contest_start_ts, contest_end_ts = _resolve_contest_metadata(
+        contest_slug, contest_problems, contest_start_ts, contest_end_ts
+    )
+    if contest_problems is None:
+        return RESULT_NA
+    
+    # Fetch all submissions for the user
+    submissions = fetch_user_submissions(leetcode_id)
+    
+    return score_submissions(leetcode_id, submissions, contest_problems, contest_start_ts, contest_end_ts)
+
+
+def _submit_fetch(executor: ThreadPoolExecutor, leetcode_id: str) -> Future:
+    """
+    Submit fetch_user_submissions, coalescing with any identical fetch in flight.
     
-    # Return count of unique accepted problems
-    return str(len(accepted_problems))
\ No newline at end of file
+    Callers asking for the same leetcode_id while a fetch is still running
+    (a duplicate sheet row, or overlapping trigger runs) get the existing
+    Future instead of issuing another request.
+    """
+    with _inflight_lock:
+        future = _inflight_fetches.get(leetcode_id)
+        if future is not None:
+            return future
+        future = executor.submit(fetch_user_submissions, leetcode_id)
+        _inflight_fetches[leetcode_id] = future
+    
+    def _forget(done_future: Future):
+        with _inflight_lock:
+            if _inflight_fetches.get(leetcode_id) is done_future:
+                del _inflight_fetches[leetcode_id]
+    
+    # Registered outside the lock: runs immediately if the fetch already finished
+    future.add_done_callback(_forget)
+    return future
+
+
+def evaluate_students(
+    students: List[Dict],
+    contest_slug: str,
+    contest_problems: List[str] = None,
+    contest_start_ts: int = None,
+    contest_end_ts: int = None,
+    max_workers: int = DEFAULT_EVAL_WORKERS
+) -> List[EvalResult]:
+    """
+    Evaluate many students concurrently.
+    
+    Only the I/O-bound half (fetch_user_submissions) runs on the thread pool;
+    scoring happens on the calling thread as each fetch completes, so parsing
+    one student's submissions overlaps with the requests still in flight for
+    the next ones. max_workers also caps the number of in-flight requests.
+    
+    Args:
+        students: Student dicts with 'name' and 'leetcode_id'
+        contest_slug: Contest identifier (e.g., "weekly-contest-477")
+        contest_problems: Contest problem titleSlugs (fetched once if not provided)
+        contest_start_ts: Contest start timestamp (fetched once if not provided)
+        contest_end_ts: Contest end timestamp (fetched once if not provided)
+        max_workers: Number of concurrent submission fetches
+    
+    Returns:
+        Results (see evaluate_student_submissions), in the same order as students
+    """
+    contest_problems, contest_start_ts, contest_end_ts = _resolve_contest_metadata(
+        contest_slug, contest_problems, contest_start_ts, contest_end_ts
+    )
+    if contest_problems is None:
+        return [RESULT_NA] * len(students)
+    
+    # Shared by every score_submissions call below
+    contest_problems = frozenset(contest_problems)
+    
+    _ensure_session_pool(max_workers)
+    
+    total = len(students)
+    results = [None] * total
+    done = 0
+    info_enabled = logger.isEnabledFor(logging.INFO)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # A student listed twice shares one fetch (and one score)
+        pending: Dict[Future, List[int]] = {}
+        for idx, student in enumerate(students):
+            future = _submit_fetch(executor, student['leetcode_id'])
+            pending.setdefault(future, []).append(idx)
+        
+        for future in as_completed(pending):
+            indices = pending[future]
+            leetcode_id = students[indices[0]]['leetcode_id']
+            
+            try:
+                result = score_submissions(
+                    leetcode_id,
+                    future.result(),
+                    contest_problems,
+                    contest_start_ts,
+                    contest_end_ts
+                )
+            except Exception as e:
+                logger.error(f"Failed to evaluate {leetcode_id}: {e}")
+                result = RESULT_NA
+            
+            for idx in indices:
+                results[idx] = result
+                done += 1
+                if info_enabled:
+                    logger.info("[%d/%d] %s (%s): %s", done, total, students[idx]['name'], leetcode_id, result)
+    
+    return results
+
+
+def summarize_results(results: List[EvalResult]) -> Dict:
+    """
+    Aggregate evaluation results in a single pass.
+    
+    Args:
+        results: Results returned by evaluate_student_submissions
+    
+    Returns:
+        Dictionary with counts for 'N/A', '0' and 'INVALID ID', plus 'solved'
+        mapping each solved count (int) to the number of students
+    """
+    counts = Counter(results)
+    return {
+        'N/A': counts.pop(RESULT_NA, 0),
+        '0': counts.pop(EvalResult(0, "OK"), 0),
+        'INVALID ID': counts.pop(RESULT_INVALID, 0),
+        'solved': {result.count: count for result, count in counts.items()}
+    }
@@ -1,8 +1,16 @@
 import gspread
-import requests
-import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from google.oauth2.service_account import Credentials
 
+from http_session import create_retrying_session
+from json_utils import parse_json
+from rate_limiter import RateLimiter
+
+
+logger = logging.getLogger(__name__)
+
 # Google Sheets setup
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
@@ -19,89 +27,86 @@ API_MIRRORS = [
     'https://alfa-pi.vercel.app'
 ]
 
+STATS_WORKERS = 8  # Users fetched concurrently
+STATS_RATE_LIMIT = 3 * len(API_MIRRORS)  # Requests/sec across all mirrors (round-robin spreads load)
+
+# Shared by all worker threads; only throttles when requests come in faster
+# than STATS_RATE_LIMIT, instead of idling a fixed time after every user
+_RATE_LIMITER = RateLimiter(rate=STATS_RATE_LIMIT, burst=STATS_WORKERS)
+
+# One keep-alive session for every mirror call; adapter retries are charged
+# to _RATE_LIMITER too (see http_session)
+_SESSION = create_retrying_session(pool_connections=16, pool_maxsize=32, rate_limiter=_RATE_LIMITER)
+
 current_mirror_index = 0
+_mirror_lock = threading.Lock()
 
 
 def get_next_mirror():
-    """Get the next API mirror in round-robin fashion."""
+    """Get the next API mirror in round-robin fashion (thread-safe)."""
     global current_mirror_index
-    mirror = API_MIRRORS[current_mirror_index]
-    current_mirror_index = (current_mirror_index + 1) % len(API_MIRRORS)
+    with _mirror_lock:
+        mirror = API_MIRRORS[current_mirror_index]
+        current_mirror_index = (current_mirror_index + 1) % len(API_MIRRORS)
     return mirror
 
 
 def fetch_solved_count(username, max_retries=3):
-    """Fetch total problems solved for a user with retry logic."""
+    """Fetch total problems solved for a user, failing over across mirrors."""
     for attempt in range(max_retries):
+        mirror = get_next_mirror()
         try:
-            mirror = get_next_mirror()
             url = f"{mirror}/{username}/solved"
-            response = requests.get(url, timeout=10)
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                wait_time = int(response.headers.get('Retry-After', 30 * (attempt + 1)))
-                print(f"Rate limited. Waiting {wait_time}s...")
-                time.sleep(wait_time)
-                continue
-            
+            _RATE_LIMITER.acquire()
+            response = _SESSION.get(url, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json(response)
             
             # Check if user exists (API returns specific structure for invalid users)
             if not data or data.get('status') == 'error':
-                print(f"Invalid LeetCode ID: {username}")
+                logger.warning(f"Invalid LeetCode ID: {username}")
                 return -1  # Signal invalid user
             
             return data.get('solvedProblem', 0)
             
-        except requests.exceptions.Timeout:
-            print(f"Timeout fetching solved count for {username} (attempt {attempt + 1}/{max_retries})")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
         except Exception as e:
-            print(f"Error fetching solved count for {username}: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
+            logger.warning(f"Error fetching solved count for {username} from {mirror} (attempt {attempt + 1}/{max_retries}): {e}")
     
-    return 0  # Return 0 after all retries failed
+    return 0  # Return 0 after all mirrors failed
 
 
 def fetch_contest_rating(username, max_retries=3):
-    """Fetch contest rating for a user with retry logic."""
+    """Fetch contest rating for a user, failing over across mirrors."""
     for attempt in range(max_retries):
+        mirror = get_next_mirror()
         try:
-            mirror = get_next_mirror()
             url = f"{mirror}/{username}/contest"
-            response = requests.get(url, timeout=10)
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                wait_time = int(response.headers.get('Retry-After', 30 * (attempt + 1)))
-                print(f"Rate limited. Waiting {wait_time}s...")
-                time.sleep(wait_time)
-                continue
-            
+            _RATE_LIMITER.acquire()
+            response = _SESSION.get(url, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json(response)
             
             # Check if user exists
             if not data or data.get('status') == 'error':
-                print(f"Invalid LeetCode ID: {username}")
+                logger.warning(f"Invalid LeetCode ID: {username}")
                 return -1  # Signal invalid user
             
             return data.get('contestRating', 0)
             
-        except requests.exceptions.Timeout:
-            print(f"Timeout fetching contest rating for {username} (attempt {attempt + 1}/{max_retries})")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
         except Exception as e:
-            print(f"Error fetching contest rating for {username}: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
+            logger.warning(f"Error fetching contest rating for {username} from {mirror} (attempt {attempt + 1}/{max_retries}): {e}")
     
-    return 0  # Return 0 after all retries failed
+    return 0  # Return 0 after all mirrors failed
+
+
+def fetch_user_stats(username):
+    """Fetch (solved count, contest rating) for a user; ('INVALID', 'INVALID') for unknown IDs."""
+    solved = fetch_solved_count(username)
+    rating = fetch_contest_rating(username)
+    
+    if solved == -1 or rating == -1:
+        return 'INVALID', 'INVALID'
+    return solved, rating
 
 
 def update_leetcode_stats():
@@ -117,58 +122,63 @@ def update_leetcode_stats():
     # Read all LeetCode IDs from column C (starting from row 2)
     leetcode_ids = worksheet.col_values(3)[1:]  # Column C, skip header
     
-    # Prepare data for batch update
-    solved_counts = []
-    contest_ratings = []
+    # Prepare data for batch update (pre-sized so rows stay aligned;
+    # empty cells keep 0)
+    total = len(leetcode_ids)
+    solved_counts = [0] * total
+    contest_ratings = [0] * total
     
-    print(f"Processing {len(leetcode_ids)} users...")
+    logger.info(f"Processing {total} users...")
     
-    for idx, username in enumerate(leetcode_ids, start=1):
-        if not username or username.strip() == '':
-            # Handle empty cells
-            solved_counts.append(0)
-            contest_ratings.append(0)
-            continue
-        
-        username = username.strip()
-        print(f"[{idx}/{len(leetcode_ids)}] Fetching data for: {username}")
-        
-        # Fetch stats
-        solved = fetch_solved_count(username)
-        rating = fetch_contest_rating(username)
-        
-        # Handle invalid users
-        if solved == -1 or rating == -1:
-            print(f"  ⚠️ Invalid LeetCode ID detected")
-            solved_counts.append('INVALID')
-            contest_ratings.append('INVALID')
-        else:
-            solved_counts.append(solved)
-            contest_ratings.append(rating)
-            print(f"  → Solved: {solved}, Rating: {rating}")
+    # Rows for each unique username, skipping empty cells, so an ID listed
+    # on several rows is fetched once and fanned back out to all of them
+    rows_by_user = {}
+    for idx, username in enumerate(leetcode_ids):
+        if username and username.strip():
+            rows_by_user.setdefault(username.strip(), []).append(idx)
+    
+    # Fetch stats concurrently; the work is almost entirely HTTP wait time
+    with ThreadPoolExecutor(max_workers=STATS_WORKERS) as executor:
+        futures = {
+            executor.submit(fetch_user_stats, username): username
+            for username in rows_by_user
+        }
         
-        # Delay between users to avoid rate limits
-        time.sleep(0.5)
+        for done, future in enumerate(as_completed(futures), start=1):
+            username = futures[future]
+            
+            try:
+                solved, rating = future.result()
+            except Exception as e:
+                logger.error(f"[{done}/{len(futures)}] {username}: failed ({e})")
+                continue
+            
+            for idx in rows_by_user[username]:
+                solved_counts[idx] = solved
+                contest_ratings[idx] = rating
+            
+            # Handle invalid users
+            if solved == 'INVALID':
+                logger.warning(f"[{done}/{len(futures)}] {username}: ⚠️ Invalid LeetCode ID detected")
+            else:
+                logger.info(f"[{done}/{len(futures)}] {username}: Solved: {solved}, Rating: {rating}")
     
     # Batch update columns D and E
-    print("\nUpdating Google Sheet...")
+    logger.info("Updating Google Sheet...")
     
     # Prepare data ranges for batch update
     start_row = 2
     end_row = start_row + len(leetcode_ids) - 1
     
-    # Update column D (Total Problems Solved)
-    solved_range = f'D{start_row}:D{end_row}'
-    solved_data = [[count] for count in solved_counts]
-    worksheet.update(solved_range, solved_data)
-    
-    # Update column E (Contest Rating)
-    rating_range = f'E{start_row}:E{end_row}'
-    rating_data = [[rating] for rating in contest_ratings]
-    worksheet.update(rating_range, rating_data)
+    # Columns D (Total Problems Solved) and E (Contest Rating) are adjacent,
+    # so write both in a single range / single request
+    stats_range = f'D{start_row}:E{end_row}'
+    stats_data = [[solved, rating] for solved, rating in zip(solved_counts, contest_ratings)]
+    worksheet.update(stats_range, stats_data)
     
-    print(f"✓ Successfully updated {len(leetcode_ids)} users!")
+    logger.info(f"✓ Successfully updated {len(leetcode_ids)} users!")
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     update_leetcode_stats()